@@ -86,6 +86,10 @@ class ConfigManager:
     def __init__(self, config_file: str = ".config.json"):
         self.config_file = Path(config_file)
         self.console = Console()
+        # Версия конфигурации: увеличивается при каждом сохранении/сбросе
+        self.version = 0
+        # Отрисованные таблицы текущей конфигурации: (версия, список renderable)
+        self._current_config_cache = None
         try:
             self.config = self._load_config()
         except Exception as e:
@@ -150,6 +154,7 @@ class ConfigManager:
             
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(config_data, f, ensure_ascii=False, indent=2)
+            self.version += 1
                 
         except Exception as e:
             self.console.print(f"[red]Ошибка сохранения конфигурации: {e}[/red]")
@@ -283,6 +288,16 @@ class ConfigManager:
     
     def show_current_config(self):
         """Отображение текущей конфигурации"""
+        cached = self._current_config_cache
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, self._build_current_config_renderables())
+            self._current_config_cache = cached
+        for renderable in cached[1]:
+            self.console.print(renderable)
+    
+    def _build_current_config_renderables(self) -> list:
+        """Построение таблиц текущей конфигурации"""
+        renderables = []
         table = Table(title="Текущая конфигурация", box=box.ROUNDED)
         table.add_column("Параметр", style="cyan")
         table.add_column("Значение", style="green")
@@ -329,14 +344,14 @@ class ConfigManager:
         
         # Storage config
         if self.config.storage:
-            self.console.print("\n[bold blue]Хранилище:[/bold blue]")
-            self.console.print(f"  Путь к списку каналов: {self.config.storage.channels_path}")
-            self.console.print(f"  Каталог экспорта: {self.config.storage.export_base_dir}")
-            self.console.print(f"  Потоки загрузки медиа: {self.config.storage.media_download_threads}")
-            self.console.print(f"  Адаптивная загрузка: {'✅' if self.config.storage.adaptive_download else '❌'}")
-            self.console.print(f"  Задержка загрузки: {self.config.storage.min_download_delay}-{self.config.storage.max_download_delay}с")
+            renderables.append("\n[bold blue]Хранилище:[/bold blue]")
+            renderables.append(f"  Путь к списку каналов: {self.config.storage.channels_path}")
+            renderables.append(f"  Каталог экспорта: {self.config.storage.export_base_dir}")
+            renderables.append(f"  Потоки загрузки медиа: {self.config.storage.media_download_threads}")
+            renderables.append(f"  Адаптивная загрузка: {'✅' if self.config.storage.adaptive_download else '❌'}")
+            renderables.append(f"  Задержка загрузки: {self.config.storage.min_download_delay}-{self.config.storage.max_download_delay}с")
         
-        self.console.print(table)
+        renderables.append(table)
         
         # Дополнительно: Хранилище и WebDAV
         storage = self.config.storage
@@ -354,7 +369,7 @@ class ConfigManager:
             table2.add_row("Уведомления", "Включены" if webdav.notify_on_sync else "Отключены", "—")
             table2.add_row("Загрузка архивов", "Включена" if webdav.upload_archives else "Отключена", "—")
             table2.add_row("Каталог архивов", webdav.archives_remote_dir or "—", "—")
-        self.console.print(table2)
+        renderables.append(table2)
         
         # Добавляем информацию о теме
         theme = self.config.theme
@@ -364,7 +379,8 @@ class ConfigManager:
         table3.add_column("Статус", style="yellow")
         table3.add_row("Текущая тема", theme.theme.replace("_", " ").title(), "—")
         table3.add_row("Автоприменение", "Включено" if theme.auto_apply else "Отключено", "—")
-        self.console.print(table3)
+        renderables.append(table3)
+        return renderables
     
     def interactive_setup(self):
         """Интерактивная настройка конфигурации"""
@@ -425,6 +441,7 @@ class ConfigManager:
                 storage=StorageConfig(),
                 webdav=WebDavConfig()
             )
+            self.version += 1
             
             self.console.print("[green]✓ Конфигурация сброшена[/green]")
             
@@ -6,18 +6,68 @@
 
 import json
 import html
+import logging
 import re
 import asyncio
 import concurrent.futures
+import functools
+from abc import ABC, abstractmethod
+from operator import attrgetter, itemgetter
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Iterator
 from dataclasses import dataclass
 from telethon.tl.types import Message, MessageMediaPhoto, MessageMediaDocument
 from telethon.errors import FloodWaitError
 import time
 import random
 
+try:
+    import orjson
+except ImportError:  # orjson необязателен, без него используется стандартный json
+    orjson = None
+
+_log = logging.getLogger(__name__)
+
+
+# Размер буфера записи файлов экспорта
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Подпись для сообщений без даты
+_UNKNOWN_DATE = 'Неизвестно'
+
+# Символы, недопустимые в именах файлов
+_FILENAME_TRANSLATION = str.maketrans(dict.fromkeys('<>:"/\\|?*', '_'))
+
+
+def load_json_bytes(data: bytes) -> Any:
+    """Разбор JSON из байтов (через orjson, если он установлен)"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except ValueError:
+            # orjson строже стандартного модуля (NaN, BOM), повторяем разбор через json
+            pass
+    return json.loads(data)
+
+
+def dump_json_bytes(obj: Any) -> bytes:
+    """JSON в UTF-8 с отступом 2, как json.dumps(obj, ensure_ascii=False, indent=2)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            # Типы или строки, которые orjson не сериализует (например, одиночные суррогаты)
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+
+def _format_datetime(value: datetime) -> str:
+    """Форматирование даты как strftime('%Y-%m-%d %H:%M:%S') без разбора формата на каждый вызов"""
+    return '%04d-%02d-%02d %02d:%02d:%02d' % (
+        value.year, value.month, value.day, value.hour, value.minute, value.second
+    )
+
 
 @dataclass
 class MessageData:
@@ -34,18 +84,28 @@ class MessageData:
     edited: Optional[datetime] = None
 
 
-class BaseExporter:
+# Поля сообщения, читаемые в циклах генерации HTML/Markdown/JSON (один вызов вместо обращения к каждому атрибуту)
+_HTML_MESSAGE_FIELDS = attrgetter('id', 'date', 'text', 'media_type', 'media_path', 'views', 'forwards', 'replies')
+_MESSAGE_FIELDS = attrgetter('id', 'date', 'author', 'media_type', 'media_path', 'text', 'views', 'forwards', 'replies', 'edited')
+_message_id = attrgetter('id')
+
+
+class BaseExporter(ABC):
     """Базовый класс для экспортеров"""
     
+    file_extension = ""
+    
     def __init__(self, channel_name: str, output_dir: Path):
         self.channel_name = channel_name
         self.output_dir = output_dir
         self.output_dir.mkdir(exist_ok=True)
     
-    def sanitize_filename(self, filename: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def sanitize_filename(filename: str) -> str:
         """Очистка имени файла от недопустимых символов"""
         # Удаление недопустимых символов для файловой системы
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', filename)
+        sanitized = filename.translate(_FILENAME_TRANSLATION)
         # Ограничение длины
         if len(sanitized) > 100:
             sanitized = sanitized[:100] + "..."
@@ -79,11 +139,34 @@ class BaseExporter:
             cleaned = re.sub(pattern, replacement, cleaned)
         
         return cleaned.strip()
+    
+    def create_empty_file(self) -> Optional[str]:
+        """Создание файла экспорта без сообщений
+        
+        В отличие от export_messages([]) не читает и не объединяет существующие
+        сообщения. Существующий файл не перезаписывается.
+        
+        Returns:
+            Путь к созданному файлу или None, если файл уже существует
+        """
+        output_file = self.output_dir / f"{self.sanitize_filename(self.channel_name)}.{self.file_extension}"
+        try:
+            with open(output_file, 'x', encoding='utf-8') as f:
+                f.write(self._render_empty())
+        except FileExistsError:
+            return None
+        return str(output_file)
+    
+    @abstractmethod
+    def _render_empty(self) -> str:
+        """Содержимое файла экспорта без сообщений"""
 
 
 class JSONExporter(BaseExporter):
     """Экспортер в JSON формат"""
     
+    file_extension = "json"
+    
     def export_messages(self, messages: List[MessageData], append_mode: bool = False) -> str:
         """Экспорт сообщений в JSON
         
@@ -96,18 +179,18 @@ class JSONExporter(BaseExporter):
         existing_messages = []
         if append_mode and output_file.exists():
             try:
-                with open(output_file, 'r', encoding='utf-8') as f:
-                    existing_data = json.load(f)
+                with open(output_file, 'rb') as f:
+                    existing_data = load_json_bytes(f.read())
                     existing_messages = existing_data.get("messages", [])
-                    print(f"JSON: Found {len(existing_messages)} existing messages in {output_file}")
+                    _log.info('JSON: Found %d existing messages in %s', len(existing_messages), output_file)
             except Exception as e:
                 # Если файл поврежден, начинаем заново
-                print(f"JSON: Error reading existing file {output_file}: {e}")
+                _log.warning('JSON: Error reading existing file %s: %s', output_file, e, exc_info=True)
                 existing_messages = []
         
         # Объединяем существующие и новые сообщения
         all_messages = existing_messages + self._messages_to_dict(messages)
-        print(f"JSON: Merged {len(existing_messages)} existing + {len(messages)} new = {len(all_messages)} total")
+        _log.info('JSON: Merged %d existing + %d new = %d total', len(existing_messages), len(messages), len(all_messages))
         
         # Убираем дубликаты по ID сообщения
         seen_ids = set()
@@ -117,10 +200,10 @@ class JSONExporter(BaseExporter):
                 seen_ids.add(msg["id"])
                 unique_messages.append(msg)
         
-        print(f"JSON: After deduplication: {len(unique_messages)} unique messages")
+        _log.info('JSON: After deduplication: %d unique messages', len(unique_messages))
         
         # Сортируем по ID сообщения (старые сначала)
-        unique_messages.sort(key=lambda x: x["id"])
+        unique_messages.sort(key=itemgetter("id"))
         
         data = {
             "channel_name": self.channel_name,
@@ -129,34 +212,183 @@ class JSONExporter(BaseExporter):
             "messages": unique_messages
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(dump_json_bytes(data))
         
         return str(output_file)
     
+    def _render_empty(self) -> str:
+        data = {
+            "channel_name": self.channel_name,
+            "export_date": datetime.now().isoformat(),
+            "total_messages": 0,
+            "messages": []
+        }
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    
     def _messages_to_dict(self, messages: List[MessageData]) -> List[Dict[str, Any]]:
         """Преобразование сообщений в словари для JSON"""
-        result = []
-        for msg in messages:
-            message_dict = {
-                "id": msg.id,
-                "date": msg.date.isoformat() if msg.date else None,
-                "text": self.clean_text(msg.text),
-                "author": msg.author,
-                "media_type": msg.media_type,
-                "media_path": msg.media_path,
-                "views": msg.views,
-                "forwards": msg.forwards,
-                "replies": msg.replies,
-                "edited": msg.edited.isoformat() if msg.edited else None
+        clean_text = self.clean_text
+        return [
+            {
+                "id": msg_id,
+                "date": date.isoformat() if date else None,
+                "text": clean_text(text),
+                "author": author,
+                "media_type": media_type,
+                "media_path": media_path,
+                "views": views,
+                "forwards": forwards,
+                "replies": replies,
+                "edited": edited.isoformat() if edited else None
             }
-            result.append(message_dict)
-        return result
+            for msg_id, date, author, media_type, media_path, text, views, forwards, replies, edited
+            in map(_MESSAGE_FIELDS, messages)
+        ]
+
+
+# Статические части HTML экспорта. Стили хранятся без экранирования фигурных скобок,
+# форматируются только небольшие фрагменты с названием канала и статистикой
+_HTML_HEAD_TEMPLATE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{channel_name} - Экспорт</title>
+"""
+
+_HTML_STYLE = """    <style>
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .header {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px;
+            border-radius: 10px;
+            margin-bottom: 20px;
+            text-align: center;
+        }
+        .message {
+            background: white;
+            margin: 10px 0;
+            padding: 15px;
+            border-radius: 10px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+            border-left: 4px solid #667eea;
+        }
+        .message-header {
+            display: flex;
+            justify-content: space-between;
+            align-items: center;
+            margin-bottom: 10px;
+            font-size: 0.9em;
+            color: #666;
+        }
+        .message-id {
+            font-weight: bold;
+            color: #667eea;
+        }
+        .message-date {
+            font-style: italic;
+        }
+        .message-text {
+            line-height: 1.6;
+            white-space: pre-wrap;
+        }
+        .message-stats {
+            margin-top: 10px;
+            font-size: 0.8em;
+            color: #888;
+            display: flex;
+            gap: 15px;
+        }
+        .media-info {
+            background: #e8f4fd;
+            padding: 10px;
+            border-radius: 5px;
+            margin: 10px 0;
+            border-left: 3px solid #2196F3;
+        }
+        .stats {
+            background: white;
+            padding: 15px;
+            border-radius: 10px;
+            margin-bottom: 20px;
+            text-align: center;
+        }
+        pre {
+            background: #f4f4f4;
+            padding: 15px;
+            border-radius: 5px;
+            border-left: 4px solid #007acc;
+            overflow-x: auto;
+            font-family: 'Courier New', Consolas, monospace;
+            font-size: 14px;
+            line-height: 1.4;
+        }
+        code {
+            background: #f4f4f4;
+            padding: 2px 6px;
+            border-radius: 3px;
+            font-family: 'Courier New', Consolas, monospace;
+            font-size: 14px;
+        }
+        pre code {
+            background: none;
+            padding: 0;
+            border-radius: 0;
+        }
+    </style>
+"""
+
+_HTML_BODY_START_TEMPLATE = """</head>
+<body>
+    <div class="header">
+        <h1>{channel_name}</h1>
+        <p>Экспорт от {export_date}</p>
+    </div>
+    
+    <div class="stats">
+        <h3>Статистика</h3>
+        <p>Всего сообщений: <strong>{total_messages}</strong></p>
+    </div>
+    
+    <div class="messages">
+        """
+
+_HTML_TAIL = """
+    </div>
+</body>
+</html>"""
+
+# Шаблоны фрагментов сообщения (разбираются один раз, подставляются через %)
+_HTML_MESSAGE_HEADER_FMT = """
+        <div class="message">
+            <div class="message-header">
+                <span class="message-id">#%s</span>
+                <span class="message-date">%s</span>
+            </div>
+            """
+_HTML_MESSAGE_TEXT_FMT = '<div class="message-text">%s</div>'
+_HTML_MEDIA_INFO_FMT = """
+            <div class="media-info">
+                <strong>Медиа:</strong> %s
+                %s
+            </div>"""
+_HTML_MEDIA_FILE_FMT = '<br><strong>Файл:</strong> %s'
+_HTML_MESSAGE_STATS_FMT = '<div class="message-stats">%s</div>'
 
 
 class HTMLExporter(BaseExporter):
     """Экспортер в HTML формат"""
     
+    file_extension = "html"
+    
     def export_messages(self, messages: List[MessageData], append_mode: bool = False) -> str:
         """Экспорт сообщений в HTML
         
@@ -173,15 +405,15 @@ class HTMLExporter(BaseExporter):
                 with open(output_file, 'r', encoding='utf-8') as f:
                     content = f.read()
                     existing_messages = self._extract_messages_from_html(content)
-                    print(f"HTML: Found {len(existing_messages)} existing messages in {output_file}")
+                    _log.info('HTML: Found %d existing messages in %s', len(existing_messages), output_file)
             except Exception as e:
                 # Если файл поврежден, начинаем заново
-                print(f"HTML: Error reading existing file {output_file}: {e}")
+                _log.warning('HTML: Error reading existing file %s: %s', output_file, e, exc_info=True)
                 existing_messages = []
         
         # Объединяем существующие и новые сообщения
         all_messages = existing_messages + messages
-        print(f"HTML: Merged {len(existing_messages)} existing + {len(messages)} new = {len(all_messages)} total")
+        _log.info('HTML: Merged %d existing + %d new = %d total', len(existing_messages), len(messages), len(all_messages))
         
         # Убираем дубликаты по ID сообщения
         seen_ids = set()
@@ -191,18 +423,20 @@ class HTMLExporter(BaseExporter):
                 seen_ids.add(msg.id)
                 unique_messages.append(msg)
         
-        print(f"HTML: After deduplication: {len(unique_messages)} unique messages")
+        _log.info('HTML: After deduplication: %d unique messages', len(unique_messages))
         
         # Сортируем по ID сообщения (старые сначала)
-        unique_messages.sort(key=lambda x: x.id)
+        unique_messages.sort(key=_message_id)
         
-        html_content = self._generate_html(unique_messages)
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Пишем фрагменты сразу в файл, не собирая весь документ в памяти
+        with open(output_file, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.writelines(self._iter_html(unique_messages))
         
         return str(output_file)
     
+    def _render_empty(self) -> str:
+        return self._generate_html([])
+    
     def _extract_messages_from_html(self, html_content: str) -> List[MessageData]:
         """Извлечение сообщений из существующего HTML файла"""
         try:
@@ -271,158 +505,50 @@ class HTMLExporter(BaseExporter):
     
     def _generate_html(self, messages: List[MessageData]) -> str:
         """Генерация HTML контента"""
-        html_template = """<!DOCTYPE html>
-<html lang="ru">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{channel_name} - Экспорт</title>
-    <style>
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            text-align: center;
-        }}
-        .message {{
-            background: white;
-            margin: 10px 0;
-            padding: 15px;
-            border-radius: 10px;
-            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-            border-left: 4px solid #667eea;
-        }}
-        .message-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 10px;
-            font-size: 0.9em;
-            color: #666;
-        }}
-        .message-id {{
-            font-weight: bold;
-            color: #667eea;
-        }}
-        .message-date {{
-            font-style: italic;
-        }}
-        .message-text {{
-            line-height: 1.6;
-            white-space: pre-wrap;
-        }}
-        .message-stats {{
-            margin-top: 10px;
-            font-size: 0.8em;
-            color: #888;
-            display: flex;
-            gap: 15px;
-        }}
-        .media-info {{
-            background: #e8f4fd;
-            padding: 10px;
-            border-radius: 5px;
-            margin: 10px 0;
-            border-left: 3px solid #2196F3;
-        }}
-        .stats {{
-            background: white;
-            padding: 15px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            text-align: center;
-        }}
-        pre {{
-            background: #f4f4f4;
-            padding: 15px;
-            border-radius: 5px;
-            border-left: 4px solid #007acc;
-            overflow-x: auto;
-            font-family: 'Courier New', Consolas, monospace;
-            font-size: 14px;
-            line-height: 1.4;
-        }}
-        code {{
-            background: #f4f4f4;
-            padding: 2px 6px;
-            border-radius: 3px;
-            font-family: 'Courier New', Consolas, monospace;
-            font-size: 14px;
-        }}
-        pre code {{
-            background: none;
-            padding: 0;
-            border-radius: 0;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>{channel_name}</h1>
-        <p>Экспорт от {export_date}</p>
-    </div>
-    
-    <div class="stats">
-        <h3>Статистика</h3>
-        <p>Всего сообщений: <strong>{total_messages}</strong></p>
-    </div>
+        return "".join(self._iter_html(messages))
     
-    <div class="messages">
-        {messages_html}
-    </div>
-</body>
-</html>"""
-        
-        messages_html = ""
-        for msg in messages:
-            message_html = f"""
-        <div class="message">
-            <div class="message-header">
-                <span class="message-id">#{msg.id}</span>
-                <span class="message-date">{msg.date.strftime('%Y-%m-%d %H:%M:%S') if msg.date else 'Неизвестно'}</span>
-            </div>
-            """
+    def _iter_html(self, messages: List[MessageData]) -> Iterator[str]:
+        """Генерация HTML контента по фрагментам (для записи в файл без сборки всей строки)"""
+        channel_name = html.escape(self.channel_name)
+        html_head = _HTML_HEAD_TEMPLATE.format(channel_name=channel_name)
+        html_body_start = _HTML_BODY_START_TEMPLATE.format(
+            channel_name=channel_name,
+            export_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            total_messages=len(messages)
+        )
+        yield html_head
+        yield _HTML_STYLE
+        yield html_body_start
+        
+        format_html_text = self._format_html_text
+        escape = html.escape
+        for msg_id, date, text, media_type, media_path, views, forwards, replies in map(_HTML_MESSAGE_FIELDS, messages):
+            yield _HTML_MESSAGE_HEADER_FMT % (msg_id, _format_datetime(date) if date else _UNKNOWN_DATE)
             
-            if msg.text:
-                formatted_text = self._format_html_text(msg.text)
-                message_html += f'<div class="message-text">{formatted_text}</div>'
+            if text:
+                formatted_text = format_html_text(text)
+                yield _HTML_MESSAGE_TEXT_FMT % formatted_text
             
-            if msg.media_type:
-                message_html += f"""
-            <div class="media-info">
-                <strong>Медиа:</strong> {msg.media_type}
-                {f'<br><strong>Файл:</strong> {msg.media_path}' if msg.media_path else ''}
-            </div>"""
+            if media_type:
+                yield _HTML_MEDIA_INFO_FMT % (
+                    escape(media_type),
+                    _HTML_MEDIA_FILE_FMT % escape(media_path) if media_path else ''
+                )
             
             stats_parts = []
-            if msg.views > 0:
-                stats_parts.append(f"👁 {msg.views}")
-            if msg.forwards > 0:
-                stats_parts.append(f"🔄 {msg.forwards}")
-            if msg.replies > 0:
-                stats_parts.append(f"💬 {msg.replies}")
+            if views > 0:
+                stats_parts.append(f"👁 {views}")
+            if forwards > 0:
+                stats_parts.append(f"🔄 {forwards}")
+            if replies > 0:
+                stats_parts.append(f"💬 {replies}")
             
             if stats_parts:
-                message_html += f'<div class="message-stats">{" | ".join(stats_parts)}</div>'
+                yield _HTML_MESSAGE_STATS_FMT % " | ".join(stats_parts)
             
-            message_html += "</div>"
-            messages_html += message_html
+            yield "</div>"
         
-        return html_template.format(
-            channel_name=html.escape(self.channel_name),
-            export_date=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            total_messages=len(messages),
-            messages_html=messages_html
-        )
+        yield _HTML_TAIL
     
     def _format_html_text(self, text: str) -> str:
         """Форматирование текста для HTML с поддержкой блоков кода"""
@@ -463,9 +589,19 @@ class HTMLExporter(BaseExporter):
         return formatted
 
 
+# Шаблоны фрагментов сообщения Markdown (разбираются один раз, подставляются через %)
+_MD_MESSAGE_HEADER_FMT = "\n## Сообщение #%s\n\n"
+_MD_DATE_FMT = "**Дата:** %s  \n"
+_MD_AUTHOR_FMT = "**Автор:** %s  \n"
+_MD_MEDIA_FMT = "**Медиа:** %s  \n"
+_MD_FILE_FMT = "**Файл:** `%s`  \n"
+
+
 class MarkdownExporter(BaseExporter):
     """Экспортер в Markdown формат"""
     
+    file_extension = "md"
+    
     def export_messages(self, messages: List[MessageData], append_mode: bool = False) -> str:
         """Экспорт сообщений в Markdown
         
@@ -482,15 +618,15 @@ class MarkdownExporter(BaseExporter):
                 with open(output_file, 'r', encoding='utf-8') as f:
                     content = f.read()
                     existing_messages = self._extract_messages_from_markdown(content)
-                    print(f"Markdown: Found {len(existing_messages)} existing messages in {output_file}")
+                    _log.info('Markdown: Found %d existing messages in %s', len(existing_messages), output_file)
             except Exception as e:
                 # Если файл поврежден, начинаем заново
-                print(f"Markdown: Error reading existing file {output_file}: {e}")
+                _log.warning('Markdown: Error reading existing file %s: %s', output_file, e, exc_info=True)
                 existing_messages = []
         
         # Объединяем существующие и новые сообщения
         all_messages = existing_messages + messages
-        print(f"Markdown: Merged {len(existing_messages)} existing + {len(messages)} new = {len(all_messages)} total")
+        _log.info('Markdown: Merged %d existing + %d new = %d total', len(existing_messages), len(messages), len(all_messages))
         
         # Убираем дубликаты по ID сообщения
         seen_ids = set()
@@ -500,18 +636,20 @@ class MarkdownExporter(BaseExporter):
                 seen_ids.add(msg.id)
                 unique_messages.append(msg)
         
-        print(f"Markdown: After deduplication: {len(unique_messages)} unique messages")
+        _log.info('Markdown: After deduplication: %d unique messages', len(unique_messages))
         
         # Сортируем по ID сообщения (старые сначала)
-        unique_messages.sort(key=lambda x: x.id)
-        
-        markdown_content = self._generate_markdown(unique_messages)
+        unique_messages.sort(key=_message_id)
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+        # Пишем фрагменты сразу в файл, не собирая весь документ в памяти
+        with open(output_file, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            f.writelines(self._iter_markdown(unique_messages))
         
         return str(output_file)
     
+    def _render_empty(self) -> str:
+        return self._generate_markdown([])
+    
     def _extract_messages_from_markdown(self, md_content: str) -> List[MessageData]:
         """Извлечение сообщений из существующего Markdown файла"""
         try:
@@ -596,10 +734,14 @@ class MarkdownExporter(BaseExporter):
     
     def _generate_markdown(self, messages: List[MessageData]) -> str:
         """Генерация Markdown контента"""
+        return "".join(self._iter_markdown(messages))
+    
+    def _iter_markdown(self, messages: List[MessageData]) -> Iterator[str]:
+        """Генерация Markdown контента по фрагментам (для записи в файл без сборки всей строки)"""
         # Безопасное название канала для заголовка
         safe_channel_name = self._safe_markdown_text(self.channel_name)
         
-        md_content = f"""# {safe_channel_name}
+        yield f"""# {safe_channel_name}
 
 **Экспорт от:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
 **Всего сообщений:** {len(messages)}
@@ -608,49 +750,48 @@ class MarkdownExporter(BaseExporter):
 
 """
         
-        for msg in messages:
-            md_content += f"\n## Сообщение #{msg.id}\n\n"
+        safe_markdown_text = self._safe_markdown_text
+        for msg_id, date, author, media_type, media_path, text, views, forwards, replies, edited in map(_MESSAGE_FIELDS, messages):
+            yield _MD_MESSAGE_HEADER_FMT % msg_id
             
             # Дата и время
-            if msg.date:
-                md_content += f"**Дата:** {msg.date.strftime('%Y-%m-%d %H:%M:%S')}  \n"
+            if date:
+                yield _MD_DATE_FMT % _format_datetime(date)
             
             # Автор (если есть)
-            if msg.author:
-                md_content += f"**Автор:** {msg.author}  \n"
+            if author:
+                yield _MD_AUTHOR_FMT % author
             
             # Медиа информация
-            if msg.media_type:
-                md_content += f"**Медиа:** {msg.media_type}  \n"
-                if msg.media_path:
-                    md_content += f"**Файл:** `{msg.media_path}`  \n"
+            if media_type:
+                yield _MD_MEDIA_FMT % media_type
+                if media_path:
+                    yield _MD_FILE_FMT % media_path
             
-            md_content += "\n"
+            yield "\n"
             
             # Текст сообщения
-            if msg.text:
+            if text:
                 # Используем безопасную функцию для предотвращения ошибок KaTeX
-                safe_text = self._safe_markdown_text(msg.text)
-                md_content += f"{safe_text}\n\n"
+                safe_text = safe_markdown_text(text)
+                yield f"{safe_text}\n\n"
             
             # Статистика
             stats_parts = []
-            if msg.views > 0:
-                stats_parts.append(f"👁 Просмотры: {msg.views}")
-            if msg.forwards > 0:
-                stats_parts.append(f"🔄 Пересылки: {msg.forwards}")
-            if msg.replies > 0:
-                stats_parts.append(f"💬 Ответы: {msg.replies}")
+            if views > 0:
+                stats_parts.append(f"👁 Просмотры: {views}")
+            if forwards > 0:
+                stats_parts.append(f"🔄 Пересылки: {forwards}")
+            if replies > 0:
+                stats_parts.append(f"💬 Ответы: {replies}")
             
             if stats_parts:
-                md_content += f"*{' | '.join(stats_parts)}*\n\n"
+                yield f"*{' | '.join(stats_parts)}*\n\n"
             
-            if msg.edited:
-                md_content += f"*Отредактировано: {msg.edited.strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
+            if edited:
+                yield f"*Отредактировано: {_format_datetime(edited)}*\n\n"
             
-            md_content += "---\n"
-        
-        return md_content
+            yield "---\n"
     
 
     def _safe_markdown_text(self, text: str) -> str:
@@ -1061,9 +1202,6 @@ class MediaDownloader:
                         
                         download_time = time.time() - download_start
                         
-                        # Небольшая пауза для завершения записи
-                        await asyncio.sleep(0.1)
-                        
                         # Проверка результата
                         if file_path.exists() and file_path.stat().st_size > 0:
                             file_size = file_path.stat().st_size
@@ -1191,9 +1329,6 @@ class MediaDownloader:
                         timeout=60.0
                     )
                     
-                    # Даем небольшую паузу для завершения записи файла
-                    await asyncio.sleep(0.1)
-                    
                     # Проверяем, что файл был создан и имеет размер больше 0
                     if file_path.exists() and file_path.stat().st_size > 0:
                         file_size = file_path.stat().st_size
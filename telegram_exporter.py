@@ -13,17 +13,20 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Set
 from pathlib import Path
 import re
+import unicodedata
 import schedule
 import time
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 import html
-import markdown
 import posixpath
 import zipfile
 from enum import Enum
 import sys
-import threading
 import queue
+import threading
+import heapq
+import itertools
+from collections import ChainMap
 
 from content_filter import ContentFilter, FilterConfig
 from telethon import TelegramClient, events
@@ -36,21 +39,72 @@ from rich.layout import Layout
 from rich.live import Live
 from rich.text import Text
 from rich.prompt import Prompt, Confirm
-from rich.progress import Progress, TaskID, BarColumn, TextColumn, TimeRemainingColumn, SpinnerColumn
 from rich import box
-from rich.align import Align
-from rich.columns import Columns
-from rich.rule import Rule
-from rich.spinner import Spinner
 import requests
 
 from exporters import (
-    MessageData, JSONExporter, HTMLExporter, MarkdownExporter, MediaDownloader, BaseExporter
+    MessageData, JSONExporter, HTMLExporter, MarkdownExporter, MediaDownloader, BaseExporter,
+    load_json_bytes, dump_json_bytes
 )
 from config_manager import ConfigManager
 from themes import ThemeManager, ThemeType
 
 
+# Заголовок сообщения в MD файле: "## Сообщение #123" (или "## Message #123")
+_MD_HEADER_MARKER = b'\n## '
+_MD_HEADER_PREFIXES = ('Сообщение #'.encode('utf-8'), b'Message #')
+# Размер блока при потоковом чтении MD файлов
+_MD_READ_CHUNK_SIZE = 1 << 20
+
+# Заголовок JSON экспорта (JSONExporter, indent=2): число сообщений записано перед их списком.
+# Строки JSON не содержат неэкранированных переводов строк, поэтому совпадение однозначно
+_JSON_TOTAL_MESSAGES_RE = re.compile(rb'\n  "total_messages": (\d+),\n  "messages": \[')
+_JSON_HEAD_READ_SIZE = 64 * 1024
+
+
+# Шаблоны уведомлений о результатах экспорта канала
+_NOTIFY_NEW_MESSAGES_TPL = (
+    "📢 <b>Новые сообщения в канале</b>\n"
+    "\n"
+    "🔗 <b>Канал:</b> {title}\n"
+    "📊 <b>Новых сообщений:</b> {count}\n"
+    "📅 <b>Время:</b> {ts}\n"
+    "✅ <b>Статус:</b> Успешно экспортировано\n"
+    "\n"
+    "📁 Файлы сохранены в папку: {title}"
+)
+_NOTIFY_NO_MESSAGES_TPL = (
+    "📢 <b>Проверка канала завершена</b>\n"
+    "\n"
+    "🔗 <b>Канал:</b> {title}\n"
+    "📊 <b>Новых сообщений:</b> не найдено\n"
+    "📅 <b>Время:</b> {ts}\n"
+    "✅ <b>Статус:</b> Проверка выполнена"
+)
+_NOTIFY_ERROR_TPL = (
+    "📢 <b>Ошибка экспорта канала</b>\n"
+    "\n"
+    "🔗 <b>Канал:</b> {title}\n"
+    "📅 <b>Время:</b> {ts}\n"
+    "❌ <b>Статус:</b> Ошибка\n"
+    "🔍 <b>Причина:</b> {error}"
+)
+_NOTIFY_REEXPORT_TPL = (
+    "🔄 <b>Выполнен реэкспорт канала</b>\n"
+    "\n"
+    "🔗 <b>Канал:</b> {title}\n"
+    "❓ <b>Причина:</b> {reason}\n"
+    "📅 <b>Время:</b> {ts}\n"
+    "✅ <b>Статус:</b> Реэкспорт завершен\n"
+    "\n"
+    "📁 Файлы сохранены в папку: {title}"
+)
+# Значения по умолчанию для полей шаблонов уведомлений
+_NOTIFY_DEFAULTS = {'error': 'Неизвестная ошибка'}
+# __slots__ для ChannelInfo: без __dict__ у каждого экземпляра (dataclass(slots=True) доступен с Python 3.10)
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
 class ExportType(Enum):
     """Типы экспорта"""
     BOTH = "both"  # Сообщения и файлы
@@ -58,7 +112,7 @@ class ExportType(Enum):
     FILES_ONLY = "files_only"  # Только файлы
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ChannelInfo:
     """Информация о канале"""
     id: int
@@ -69,6 +123,62 @@ class ChannelInfo:
     last_check: Optional[str] = None
     media_size_mb: float = 0.0  # Кэшированный размер медиафайлов в МБ
     export_type: ExportType = ExportType.BOTH  # Тип экспорта
+    # Поля ниже существуют только во время работы программы: не передаются в конструктор
+    # и не сохраняются в файл каналов
+    # Разобранное значение last_check
+    last_check_dt: Optional[datetime] = field(init=False, repr=False, compare=False)
+    # Название канала, очищенное для имени папки и файлов
+    sanitized_title: Optional[str] = field(init=False, repr=False, compare=False)
+    # Признак принудительного полного ре-экспорта
+    force_full_reexport: bool = field(init=False, repr=False, compare=False)
+    # Канал экспортируется в рамках проверки/ре-экспорта MD: проверка MD после экспорта не выполняется
+    in_md_verification: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.last_check_dt = None
+        self.sanitized_title = None
+        self.force_full_reexport = False
+        self.in_md_verification = False
+        if self.last_check:
+            try:
+                self.last_check_dt = datetime.fromisoformat(self.last_check)
+            except (TypeError, ValueError):
+                self.last_check_dt = None
+
+
+# Поля ChannelInfo, которые существуют только во время работы программы
+_CHANNEL_RUNTIME_FIELDS = ('last_check_dt', 'sanitized_title', 'force_full_reexport', 'in_md_verification')
+
+
+def _channel_to_dict(channel: ChannelInfo) -> dict:
+    """Преобразование канала в словарь для сохранения в JSON"""
+    channel_dict = asdict(channel)
+    for name in _CHANNEL_RUNTIME_FIELDS:
+        channel_dict.pop(name, None)
+    # Преобразуем ExportType в строку
+    if isinstance(channel_dict.get('export_type'), ExportType):
+        channel_dict['export_type'] = channel_dict['export_type'].value
+    return channel_dict
+
+
+def _channel_dir_key(name: str) -> str:
+    """Ключ для сравнения имени папки канала с именем на диске
+    
+    Не учитывает регистр и завершающие точки/пробелы (Windows) и приводит имя к NFC:
+    macOS возвращает имена в NFD, и без нормализации "й"/"ё" в названии не совпадут.
+    """
+    return unicodedata.normalize('NFC', name.rstrip(' .').casefold())
+
+
+def _message_replies_count(message) -> int:
+    """Количество ответов на сообщение (0, если счётчик отсутствует)"""
+    replies = getattr(message, 'replies', None)
+    if not replies:
+        return 0
+    count = getattr(replies, 'replies', None)
+    if count is None:
+        count = getattr(replies, 'replies_pts', 0)
+    return count or 0
 
 
 @dataclass
@@ -104,14 +214,39 @@ class TelegramExporter:
     BATCH_SIZE = 1000  # Размер батча для обработки сообщений
     MAX_MESSAGES_PER_EXPORT = 50000  # Максимум сообщений за один экспорт
     PROGRESS_UPDATE_INTERVAL = 100  # Интервал обновления прогресса
+    MISSING_MD_EXPORT_CONCURRENCY = 4  # Максимум одновременных ре-экспортов каналов без MD файлов
+    EXPORT_CONCURRENCY = 3  # Максимум одновременно экспортируемых каналов при плановом проходе
+    UI_IDLE_REFRESH_INTERVAL = 2.0  # Интервал перерисовки интерфейса в простое (секунды)
+    UI_MIN_REDRAW_INTERVAL = 0.5  # Минимальный интервал между перерисовками при изменениях (секунды)
+    SCHEDULER_MAX_SLEEP = 300.0  # Максимальная пауза между проверками задач планировщика (секунды)
     
-    def __init__(self):
+    def __init__(self, config_manager: Optional[ConfigManager] = None, content_filter: Optional[ContentFilter] = None):
+        """Инициализация экспортера
+        
+        Args:
+            config_manager: Готовый менеджер конфигурации (по умолчанию создаётся новый)
+            content_filter: Готовый фильтр контента, например общий для нескольких экспортеров
+        """
         self.console = Console()
         self.client: Optional[TelegramClient] = None
         self.channels: List[ChannelInfo] = []
         self.stats = ExportStats()
         self.running = True
         
+        # Кэш отформатированного текущего времени (обновляется раз в секунду)
+        self._now_cache = ""
+        self._now_cache_t = -1
+        # Последнее отформатированное время проверки каналов (общее для прохода планировщика)
+        self._last_check_now: Optional[datetime] = None
+        self._last_check_str = ""
+        # Счётчик изменений last_check и кэш числа проверенных каналов для статусного экрана:
+        # (список каналов, его длина, значение счётчика, число каналов)
+        self._last_check_version = 0
+        self._active_channels_cache: Optional[tuple] = None
+        
+        # Событие "интерфейс устарел": выставляется при изменении статистики и состояния каналов
+        self._ui_dirty = asyncio.Event()
+        
         # Параметры прокрутки для главного экрана
         self.channels_scroll_offset = 0
         self.channels_display_limit = 10  # Количество каналов на экране
@@ -121,8 +256,19 @@ class TelegramExporter:
         self.key_thread = None
         self.key_thread_running = False
         
+        # Каркас статусного экрана (создаётся при первой отрисовке)
+        self._status_layout: Optional[Layout] = None
+        self._status_panels: tuple = ()
+        # Индексы каналов по названию и готовые ячейки строк таблицы мониторинга
+        self._channel_index: Dict[str, int] = {}
+        self._channel_row_cache: Dict[str, tuple] = {}
+        # Таблицы списка каналов в меню: имя меню -> (отображаемые данные каналов, таблица)
+        self._channels_table_cache: Dict[str, tuple] = {}
+        # Путь к файлу списка каналов: (значение из конфигурации, Path)
+        self._channels_path_cache: Optional[tuple] = None
+        
         # Инициализация менеджера конфигурации
-        self.config_manager = ConfigManager()
+        self.config_manager = config_manager or ConfigManager()
         
         # Инициализация системы тем
         self.theme_manager = ThemeManager()
@@ -136,29 +282,147 @@ class TelegramExporter:
             channels_path = '.channels'
         self.channels_file = Path(channels_path)
 
-        # Инициализация фильтра контента
-        self.content_filter = ContentFilter()
+        # Кэш путей к MD файлам каналов (название канала -> путь)
+        self._channel_md_path: Dict[str, Path] = {}
+        self._channel_md_path_base: Optional[Path] = None
+        # Кэш проверки MD файлов (название канала -> (размер, mtime_ns, число сообщений))
+        self._md_verify_cache: Dict[str, tuple[int, int, int]] = {}
+        # Кэш числа сообщений в JSON экспорте (название канала -> (размер, mtime_ns, число сообщений))
+        self._exported_count_cache: Dict[str, tuple[int, int, int]] = {}
+        # Названия каналов, экспорт которых сейчас выполняется: основной экспорт, экспорт каналов
+        # без MD и ежедневная проверка идут одновременно и не должны обрабатывать один канал дважды
+        self._exporting_channels: Set[str] = set()
+        # Состояние экспорта отдельно для каждого канала, так как каналы экспортируются параллельно:
+        # строка прогресса (название канала -> текст) и число попыток ре-экспорта из-за MD файла
+        self._export_infos: Dict[str, str] = {}
+        self._md_reexport_attempts: Dict[str, int] = {}
+        # Счётчики повторов после FloodWait (название канала -> число попыток);
+        # отдельно для каждого канала, так как каналы могут экспортироваться параллельно
+        self._floodwait_retries: Dict[str, int] = {}
+        # Базовый каталог экспорта из настроек хранилища
+        self._base_path = Path('exports')
+        self._refresh_paths()
+        
+        # Инициализация фильтра контента (набор маркеров и регулярных выражений строится один раз)
+        self.content_filter = content_filter or ContentFilter()
         
         # Настройка логирования
         self.setup_logging()
         
-    def _sanitize_channel_filename(self, channel_title: str) -> str:
+    @staticmethod
+    def _sanitize_channel_filename(channel_title: str) -> str:
         """Sanitize channel title for use as filename using the same logic as exporters"""
-        # Use the same sanitization logic as BaseExporter
-        sanitized = re.sub(r'[<>:"/\\|?*]', '_', channel_title)
-        # Ограничение длины
-        if len(sanitized) > 100:
-            sanitized = sanitized[:100] + "..."
-        return sanitized
+        # Общая реализация BaseExporter: одно скомпилированное выражение и один кэш результатов
+        return BaseExporter.sanitize_filename(channel_title)
+    
+    def _get_sanitized_title(self, channel: ChannelInfo) -> str:
+        """Очищенное название канала (вычисляется один раз и хранится в ChannelInfo)"""
+        if channel.sanitized_title is None:
+            channel.sanitized_title = self._sanitize_channel_filename(channel.title)
+        return channel.sanitized_title
+    
+    def _now_str(self) -> str:
+        """Текущее время в формате "%Y-%m-%d %H:%M:%S" (strftime не чаще раза в секунду)"""
+        t = int(time.monotonic())
+        if t != self._now_cache_t:
+            self._now_cache = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            self._now_cache_t = t
+        return self._now_cache
+    
+    def _claim_channel_export(self, channel: ChannelInfo) -> bool:
+        """Отмечает начало экспорта канала
+        
+        Returns:
+            bool: False, если канал уже экспортируется другой задачей
+        """
+        if channel.title in self._exporting_channels:
+            self.logger.info(f"Канал {channel.title} уже экспортируется другой задачей, пропуск")
+            return False
+        self._exporting_channels.add(channel.title)
+        return True
+    
+    def _release_channel_export(self, channel: ChannelInfo):
+        """Отмечает окончание экспорта канала"""
+        self._exporting_channels.discard(channel.title)
+    
+    def _set_export_info(self, channel: ChannelInfo, text: str):
+        """Обновляет строку прогресса экспорта канала и показывает её в статусе"""
+        self._export_infos[channel.title] = text
+        self.stats.current_export_info = text
+    
+    def _clear_export_info(self, channel: ChannelInfo):
+        """Убирает строку прогресса канала; в статусе остаётся прогресс другого экспортируемого канала"""
+        self._export_infos.pop(channel.title, None)
+        self._refresh_export_info()
+    
+    def _refresh_export_info(self):
+        """Показывает в статусе прогресс последнего ещё экспортируемого канала (или ничего)"""
+        self.stats.current_export_info = next(reversed(self._export_infos.values()), None)
+    
+    def _touch_last_check(self, channel: ChannelInfo, now: Optional[datetime] = None):
+        """Отмечает время последней проверки канала
+        
+        Args:
+            channel: Канал
+            now: Время проверки; при обходе всех каналов передаётся одно значение на проход
+        """
+        if now is None:
+            now = datetime.now()
+        if now is not self._last_check_now:
+            self._last_check_now = now
+            self._last_check_str = now.strftime("%Y-%m-%d %H:%M:%S")
+        channel.last_check = self._last_check_str
+        channel.last_check_dt = now
+        self._last_check_version += 1
+    
+    def _count_active_channels(self) -> int:
+        """Число уже проверявшихся каналов (пересчитывается только после изменения списка или last_check)"""
+        channels = self.channels
+        cached = self._active_channels_cache
+        if (cached is None or cached[0] is not channels or cached[1] != len(channels)
+                or cached[2] != self._last_check_version):
+            count = sum(1 for ch in channels if ch.last_check)
+            cached = (channels, len(channels), self._last_check_version, count)
+            self._active_channels_cache = cached
+        return cached[3]
+    
+    def _get_channel_md_path(self, channel: ChannelInfo, base_path: Path) -> Path:
+        """Путь к MD файлу канала (кэшируется по названию канала)"""
+        if base_path != self._channel_md_path_base:
+            self._channel_md_path.clear()
+            self._channel_md_path_base = base_path
+        md_file = self._channel_md_path.get(channel.title)
+        if md_file is None:
+            sanitized_title = self._get_sanitized_title(channel)
+            md_file = base_path / sanitized_title / f"{sanitized_title}.md"
+            self._channel_md_path[channel.title] = md_file
+        return md_file
     
     # ===== Вспомогательные методы пути хранения =====
+    def _refresh_paths(self):
+        """Перечитывает базовый каталог экспорта из конфигурации (вызывать после изменения настроек)"""
+        try:
+            storage_cfg = self.config_manager.config.storage  # type: ignore[attr-defined]
+            base_dir = getattr(storage_cfg, 'export_base_dir', 'exports') or 'exports'
+        except Exception:
+            base_dir = 'exports'
+        self._base_path = Path(base_dir)
+        self._channel_md_path.clear()
+        self._md_verify_cache.clear()
+        self._exported_count_cache.clear()
+    
     def _get_channels_file_path(self) -> Path:
         try:
             storage_cfg = self.config_manager.config.storage  # type: ignore[attr-defined]
             channels_path = getattr(storage_cfg, 'channels_path', None)
-            return Path(channels_path) if channels_path else Path('.channels')
         except Exception:
-            return Path('.channels')
+            channels_path = None
+        # Path создаётся заново только после изменения пути в конфигурации
+        cached = self._channels_path_cache
+        if cached is None or cached[0] != channels_path:
+            cached = (channels_path, Path(channels_path) if channels_path else Path('.channels'))
+            self._channels_path_cache = cached
+        return cached[1]
 
     # ===== WebDAV синхронизация =====
     def _webdav_enabled(self) -> bool:
@@ -287,9 +551,9 @@ class TelegramExporter:
             self._webdav_make_dirs(base_url, auth, posixpath.join(remote_dir, 'dummy'))
             remote_name = archive_path.name
             url = self._webdav_build_url(base_url, posixpath.join(remote_dir, remote_name))
+            # Передаём файл потоком, не загружая архив канала в память целиком
             with open(archive_path, 'rb') as f:
-                data = f.read()
-            resp = requests.put(url, data=data, auth=auth, timeout=60)
+                resp = requests.put(url, data=f, auth=auth, timeout=60)
             if resp.status_code in (200, 201, 204):
                 self.logger.info(f"Archive uploaded to WebDAV: {url}")
                 return True
@@ -371,6 +635,9 @@ class TelegramExporter:
                                 errors.append(f"Элемент {i + 1}: неизвестный тип экспорта '{export_type_value}', используется BOTH")
                     else:
                         item['export_type'] = ExportType.BOTH
+                    # Служебные поля времени выполнения из файла не принимаются
+                    for name in _CHANNEL_RUNTIME_FIELDS:
+                        item.pop(name, None)
                         
                     channel = ChannelInfo(**item)
                     valid_channels.append(channel)
@@ -407,16 +674,10 @@ class TelegramExporter:
         """Сохранение списка каналов в произвольный JSON-файл для редактирования"""
         try:
             # Преобразуем каналы в словарь с правильной сериализацией enum
-            channels_data = []
-            for channel in self.channels:
-                channel_dict = asdict(channel)
-                # Преобразуем ExportType в строку
-                if 'export_type' in channel_dict and isinstance(channel_dict['export_type'], ExportType):
-                    channel_dict['export_type'] = channel_dict['export_type'].value
-                channels_data.append(channel_dict)
+            channels_data = [_channel_to_dict(channel) for channel in self.channels]
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(channels_data, f, ensure_ascii=False, indent=2)
+            with open(file_path, 'wb') as f:
+                f.write(dump_json_bytes(channels_data))
                 
             self.console.print(f"[green]✓ Список каналов сохранен в {file_path}[/green]")
             return True
@@ -653,6 +914,9 @@ class TelegramExporter:
                                 self.logger.warning(f"Неизвестный тип экспорта '{export_type_value}' для канала {item.get('title', 'unknown')}, используется BOTH")
                     else:
                         item['export_type'] = ExportType.BOTH
+                    # Служебные поля времени выполнения из файла не принимаются
+                    for name in _CHANNEL_RUNTIME_FIELDS:
+                        item.pop(name, None)
                         
                     channel = ChannelInfo(**item)
                     valid_channels.append(channel)
@@ -686,16 +950,10 @@ class TelegramExporter:
             self.channels_file = self._get_channels_file_path()
             
             # Преобразуем каналы в словарь с правильной сериализацией enum
-            channels_data = []
-            for channel in self.channels:
-                channel_dict = asdict(channel)
-                # Преобразуем ExportType в строку
-                if 'export_type' in channel_dict and isinstance(channel_dict['export_type'], ExportType):
-                    channel_dict['export_type'] = channel_dict['export_type'].value
-                channels_data.append(channel_dict)
+            channels_data = [_channel_to_dict(channel) for channel in self.channels]
             
-            with open(self.channels_file, 'w', encoding='utf-8') as f:
-                json.dump(channels_data, f, ensure_ascii=False, indent=2)
+            with open(self.channels_file, 'wb') as f:
+                f.write(dump_json_bytes(channels_data))
                 
             # WebDAV upload
             if self._webdav_enabled():
@@ -730,6 +988,45 @@ class TelegramExporter:
         
         return table
 
+    @staticmethod
+    def _parse_number_selection(command: str, limit: int) -> Optional[set]:
+        """Разбор списка номеров и диапазонов вида "1,3-6" за один проход
+        
+        Args:
+            command: Введённая строка
+            limit: Количество доступных номеров (номера считаются с 1)
+            
+        Returns:
+            Optional[set]: Множество номеров или None при неверном формате.
+            Диапазоны обрезаются по границам, одиночный номер вне границ считается ошибкой.
+        """
+        numbers = set()
+        for token in command.split(','):
+            token = token.strip()
+            if not token:
+                continue
+            if '-' in token:
+                parts = token.split('-')
+                if len(parts) != 2:
+                    return None
+                try:
+                    a = int(parts[0])
+                    b = int(parts[1])
+                except ValueError:
+                    return None
+                if a > b:
+                    a, b = b, a
+                numbers.update(range(max(a, 1), min(b, limit) + 1))
+            else:
+                try:
+                    num = int(token)
+                except ValueError:
+                    return None
+                if not 1 <= num <= limit:
+                    return None
+                numbers.add(num)
+        return numbers
+    
     async def select_channels(self):
         """Выбор каналов для мониторинга с постраничным отображением и удобными командами"""
         self.console.print("\n[bold blue]Получение списка каналов...[/bold blue]")
@@ -773,20 +1070,20 @@ class TelegramExporter:
                 self.console.print(f"[dim]Страница {current_page + 1} из {total_pages} | Выбрано: {len(selected_ids)}[/dim]")
                 
                 # Получение команды
-                command = Prompt.ask("\nВведите команду").strip().lower()
+                command = (await self._ask(Prompt, "\nВведите команду")).strip().lower()
                 
                 if command == 'p':
                     if current_page > 0:
                         current_page -= 1
                     else:
                         self.console.print("[yellow]⚠ Вы уже на первой странице[/yellow]")
-                        input("Нажмите Enter для продолжения...")
+                        await self._await_enter()
                 elif command == 'n':
                     if current_page < total_pages - 1:
                         current_page += 1
                     else:
                         self.console.print("[yellow]⚠ Вы уже на последней странице[/yellow]")
-                        input("Нажмите Enter для продолжения...")
+                        await self._await_enter()
                 elif command == 'sa':
                     # Select All on page
                     start_idx = current_page * page_size
@@ -802,7 +1099,7 @@ class TelegramExporter:
                 elif command == 'x':
                     selected_ids.clear()
                 elif command == 'f':
-                    query = Prompt.ask("Поиск по названию/username (пусто — показать все)", default="")
+                    query = await self._ask(Prompt, "Поиск по названию/username (пусто — показать все)", default="")
                     q = query.strip().lower()
                     if not q:
                         dialogs = list(all_dialogs)
@@ -822,54 +1119,17 @@ class TelegramExporter:
                     return
                 else:
                     # попытка разобрать как список номеров/диапазонов
-                    tokens = [t.strip() for t in command.split(',') if t.strip()]
-                    if not tokens:
+                    if not command.replace(',', '').strip():
                         self.console.print("[red]❌ Неверная команда[/red]")
-                        input("Нажмите Enter для продолжения...")
+                        await self._await_enter()
                         continue
-                    ok = True
-                    for token in tokens:
-                        if '-' in token:
-                            parts = token.split('-')
-                            if len(parts) != 2:
-                                ok = False
-                                break
-                            try:
-                                a = int(parts[0])
-                                b = int(parts[1])
-                            except ValueError:
-                                ok = False
-                                break
-                            if a > b:
-                                a, b = b, a
-                            for num in range(a, b + 1):
-                                if 1 <= num <= len(dialogs):
-                                    dlg = dialogs[num - 1]
-                                    dlg_id = getattr(dlg.entity, 'id', None)
-                                    if dlg_id in selected_ids:
-                                        selected_ids.discard(dlg_id)
-                                    else:
-                                        selected_ids.add(dlg_id)
-                        else:
-                            try:
-                                num = int(token)
-                            except ValueError:
-                                ok = False
-                                break
-                            if 1 <= num <= len(dialogs):
-                                dlg = dialogs[num - 1]
-                                dlg_id = getattr(dlg.entity, 'id', None)
-                                if dlg_id in selected_ids:
-                                    selected_ids.discard(dlg_id)
-                                else:
-                                    selected_ids.add(dlg_id)
-                            else:
-                                ok = False
-                                break
-                    if not ok:
+                    numbers = self._parse_number_selection(command, len(dialogs))
+                    if numbers is None:
                         self.console.print("[red]❌ Неверный формат. Используйте числа и диапазоны, например: 1,3-6[/red]")
-                        input("Нажмите Enter для продолжения...")
+                        await self._await_enter()
                         continue
+                    # Переключаем выбор всех указанных каналов разом (повторы в списке не учитываются)
+                    selected_ids ^= {getattr(dialogs[num - 1].entity, 'id', None) for num in numbers}
             
             # Финализация выбора
             if not selected_ids:
@@ -895,15 +1155,17 @@ class TelegramExporter:
             self.console.print(f"[red]Ошибка выбора каналов: {e}[/red]")
             self.logger.error(f"Channel selection error: {e}")
     
+    def _mark_ui_dirty(self):
+        """Запрашивает перерисовку статусного экрана"""
+        self._ui_dirty.set()
+    
     def create_status_display(self) -> Layout:
         """Создание информативного статусного экрана с двумя панелями"""
-        layout = Layout()
-        
-        layout.split_column(
-            Layout(name="header", size=3),
-            Layout(name="main"),
-            Layout(name="footer", size=3)
-        )
+        # Каркас экрана (разметка и панели) строится один раз, при перерисовке меняется только содержимое
+        if self._status_layout is None:
+            self._status_layout = self._build_status_layout()
+        layout = self._status_layout
+        header_panel, channels_panel, stats_panel, footer_panel = self._status_panels
         
         # Заголовок с анимацией
         current_time = int(time.time() * 2) % 4
@@ -925,7 +1187,32 @@ class TelegramExporter:
             export_icon = export_animation[current_time]
             header_text.append(f" | {export_icon} {self.stats.current_export_info}", style=colors.warning)
         
-        layout["header"].update(Panel(header_text, box=box.DOUBLE, border_style=colors.border_bright))
+        header_panel.renderable = header_text
+        header_panel.border_style = colors.border_bright
+        
+        # Левая панель - таблица каналов на 100% высоты левой части
+        channels_panel.renderable = self._create_detailed_channels_table()
+        channels_panel.border_style = colors.primary
+        
+        # Правая панель - детальная статистика
+        stats_panel.renderable = self._create_detailed_statistics()
+        stats_panel.border_style = colors.secondary
+        
+        # Добавляем информацию о подвале
+        footer_panel.renderable = self._create_footer_info()
+        footer_panel.border_style = colors.success
+        
+        return layout
+    
+    def _build_status_layout(self) -> Layout:
+        """Каркас статусного экрана: разметка и панели с постоянными заголовками"""
+        layout = Layout()
+        
+        layout.split_column(
+            Layout(name="header", size=3),
+            Layout(name="main"),
+            Layout(name="footer", size=3)
+        )
         
         # Главная область - разделена на левую и правую панели (7:3) для 70% каналов и 30% статистики
         layout["main"].split_row(
@@ -933,35 +1220,28 @@ class TelegramExporter:
             Layout(name="right", ratio=3)
         )
         
-        # Левая панель - таблица каналов на 100% высоты левой части
-        channels_table = self._create_detailed_channels_table()
-        layout["main"]["left"].update(Panel(
-            channels_table, 
+        header_panel = Panel("", box=box.DOUBLE)
+        channels_panel = Panel(
+            "", 
             title="📺 Мониторинг каналов", 
             box=box.ROUNDED, 
             expand=True,
-            border_style=colors.primary,
             title_align="left"
-        ))
-        
-        # Правая панель - детальная статистика
-        stats_content = self._create_detailed_statistics()
-        layout["main"]["right"].update(Panel(
-            stats_content, 
+        )
+        stats_panel = Panel(
+            "", 
             title="📊 Статистика", 
             box=box.ROUNDED,
-            border_style=colors.secondary,
             title_align="left"
-        ))
+        )
+        footer_panel = Panel("", box=box.ROUNDED)
         
-        # Добавляем информацию о подвале
-        footer_content = self._create_footer_info()
-        layout["footer"].update(Panel(
-            footer_content, 
-            box=box.ROUNDED,
-            border_style=colors.success
-        ))
+        layout["header"].update(header_panel)
+        layout["main"]["left"].update(channels_panel)
+        layout["main"]["right"].update(stats_panel)
+        layout["footer"].update(footer_panel)
         
+        self._status_panels = (header_panel, channels_panel, stats_panel, footer_panel)
         return layout
 
     def _create_detailed_channels_table(self) -> Table:
@@ -1002,10 +1282,7 @@ class TelegramExporter:
         # Находим индекс текущего канала
         current_channel_index = -1
         if current_export_channel_title:
-            for i, channel in enumerate(self.channels):
-                if channel.title == current_export_channel_title:
-                    current_channel_index = i
-                    break
+            current_channel_index = self._find_channel_index(current_export_channel_title)
         
         # Определяем диапазон отображения для автоматической прокрутки
         max_visible_channels = 25  # Увеличиваем для лучшего использования вертикального пространства
@@ -1025,14 +1302,10 @@ class TelegramExporter:
         
         for i, channel in enumerate(display_channels):
             actual_index = start_index + i
-            last_check = channel.last_check or "Никогда"
+            channel_name, last_check, msg_str, size_str = self._get_channel_row_cells(channel)
             
             # Определяем статус канала с анимацией
             status = "Ожидание"
-            # Более компактное имя для лучшего использования пространства
-            channel_name = channel.title
-            if len(channel_name) > 40:  # Увеличиваем допустимую длину
-                channel_name = channel_name[:37] + "..."
             
             # Подсвечиваем текущий экспортируемый канал с анимацией
             if actual_index == current_channel_index:
@@ -1047,31 +1320,6 @@ class TelegramExporter:
             else:
                 status = f"[{colors.text_muted}]⏳ Ожид.[/{colors.text_muted}]"
             
-            # Компактное форматирование даты
-            if last_check != "Никогда":
-                try:
-                    dt = datetime.strptime(last_check, "%Y-%m-%d %H:%M:%S")
-                    last_check = dt.strftime("%d.%m %H:%M")
-                except:
-                    last_check = last_check[:10] if len(last_check) > 10 else last_check
-            else:
-                last_check = "Никогда"
-            
-            # Форматирование количества сообщений (полное число без сокращений)
-            msg_count = channel.total_messages
-            msg_str = str(msg_count)
-            
-            # Форматирование размера медиафайлов
-            if channel.media_size_mb > 0:
-                if channel.media_size_mb < 1:
-                    size_str = f"{channel.media_size_mb * 1024:.0f} КБ"
-                elif channel.media_size_mb < 1024:
-                    size_str = f"{channel.media_size_mb:.1f} МБ"
-                else:
-                    size_str = f"{channel.media_size_mb / 1024:.1f} ГБ"
-            else:
-                size_str = "—"
-            
             channels_table.add_row(
                 channel_name,
                 last_check,
@@ -1108,6 +1356,56 @@ class TelegramExporter:
         
         return channels_table
 
+    def _find_channel_index(self, title: str) -> int:
+        """Индекс канала по названию (словарь перестраивается, только если список каналов изменился)"""
+        index = self._channel_index.get(title)
+        if index is None or index >= len(self.channels) or self.channels[index].title != title:
+            self._channel_index = {}
+            for i, channel in enumerate(self.channels):
+                self._channel_index.setdefault(channel.title, i)
+            index = self._channel_index.get(title)
+        return -1 if index is None else index
+    
+    def _get_channel_row_cells(self, channel: ChannelInfo) -> tuple[str, str, str, str]:
+        """Отформатированные ячейки строки канала (название, проверка, сообщения, размер)
+        
+        Ячейки пересчитываются только при изменении данных канала, а не при каждой перерисовке.
+        """
+        state = (channel.last_check, channel.total_messages, channel.media_size_mb)
+        cached = self._channel_row_cache.get(channel.title)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+        
+        # Более компактное имя для лучшего использования пространства
+        channel_name = channel.title
+        if len(channel_name) > 40:  # Увеличиваем допустимую длину
+            channel_name = channel_name[:37] + "..."
+        
+        # Компактное форматирование даты
+        last_check = channel.last_check or "Никогда"
+        if channel.last_check_dt is not None:
+            last_check = channel.last_check_dt.strftime("%d.%m %H:%M")
+        elif last_check != "Никогда":
+            last_check = last_check[:10] if len(last_check) > 10 else last_check
+        
+        # Форматирование количества сообщений (полное число без сокращений)
+        msg_str = str(channel.total_messages)
+        
+        # Форматирование размера медиафайлов
+        if channel.media_size_mb > 0:
+            if channel.media_size_mb < 1:
+                size_str = f"{channel.media_size_mb * 1024:.0f} КБ"
+            elif channel.media_size_mb < 1024:
+                size_str = f"{channel.media_size_mb:.1f} МБ"
+            else:
+                size_str = f"{channel.media_size_mb / 1024:.1f} ГБ"
+        else:
+            size_str = "—"
+        
+        cells = (channel_name, last_check, msg_str, size_str)
+        self._channel_row_cache[channel.title] = (state, cells)
+        return cells
+    
     def _create_detailed_statistics(self) -> Text:
         """Создает детальную статистику для правой панели с анимацией и прогресс-барами"""
         stats_text = Text()
@@ -1153,7 +1451,7 @@ class TelegramExporter:
         
         # Создаем прогресс-бар для каналов
         if self.stats.total_channels > 0:
-            active_channels = sum(1 for ch in self.channels if ch.last_check)
+            active_channels = self._count_active_channels()
             progress_percent = (active_channels / self.stats.total_channels) * 100
             progress_bar = self._create_progress_bar(progress_percent, 20)
             stats_text.append(f"Каналов: {self.stats.total_channels} ", style="green")
@@ -1404,28 +1702,22 @@ class TelegramExporter:
         if max_val == min_val:
             return "─" * width
         
-        # Создаем график
+        # Нормализуем один раз, а не для каждой строки графика
+        span = max_val - min_val
+        normalized = [(value - min_val) / span for value in values[:width]]
+        padding = " " * (width - len(normalized))
+        
+        # Создаем график: каждая строка собирается одним join
         chart_lines = []
         for row in range(height):
-            line = ""
-            for col in range(width):
-                if col < len(values):
-                    # Нормализуем значение для текущей строки
-                    normalized = (values[col] - min_val) / (max_val - min_val)
-                    threshold = (height - 1 - row) / height
-                    
-                    if normalized >= threshold:
-                        if row == height - 1:  # Нижняя строка
-                            line += "█"
-                        elif row == 0:  # Верхняя строка
-                            line += "▔"
-                        else:
-                            line += "▊"
-                    else:
-                        line += " "
-                else:
-                    line += " "
-            chart_lines.append(line)
+            threshold = (height - 1 - row) / height
+            if row == height - 1:  # Нижняя строка
+                bar = "█"
+            elif row == 0:  # Верхняя строка
+                bar = "▔"
+            else:
+                bar = "▊"
+            chart_lines.append("".join(bar if n >= threshold else " " for n in normalized) + padding)
         
         return "\n".join(chart_lines)
 
@@ -1453,39 +1745,57 @@ class TelegramExporter:
         
         return self._create_mini_chart(speeds, 15, 4)
 
+    def _count_exported_messages(self, channel: ChannelInfo) -> int:
+        """Количество сообщений в JSON файле экспорта канала (0, если файла нет)"""
+        sanitized_title = self._get_sanitized_title(channel)
+        json_file = self._base_path / sanitized_title / f"{sanitized_title}.json"
+        
+        try:
+            st = json_file.stat()
+        except OSError:
+            return 0
+        
+        # Файл не менялся с прошлого подсчёта - разбирать JSON повторно не нужно
+        cached = self._exported_count_cache.get(channel.title)
+        if cached and cached[:2] == (st.st_size, st.st_mtime_ns):
+            return cached[2]
+        
+        count = 0
+        try:
+            # Формат файла известен: берём total_messages из начала файла,
+            # не разбирая весь JSON. Полный разбор - только для файлов другого формата
+            with open(json_file, 'rb') as f:
+                match = _JSON_TOTAL_MESSAGES_RE.search(f.read(_JSON_HEAD_READ_SIZE))
+                if match:
+                    count = int(match.group(1))
+                else:
+                    f.seek(0)
+                    export_data = load_json_bytes(f.read())
+                    
+                    if isinstance(export_data, list):
+                        count = len(export_data)
+                    elif isinstance(export_data, dict) and 'messages' in export_data:
+                        count = len(export_data['messages'])
+        except Exception as e:
+            self.logger.debug(f"Error reading export file for {channel.title}: {e}")
+            return 0
+        self._exported_count_cache[channel.title] = (st.st_size, st.st_mtime_ns, count)
+        return count
+    
     def _update_discovered_exported_stats(self):
-        """Обновляет статистику обнаруженных и экспортированных сообщений"""
+        """Обновляет статистику обнаруженных и экспортированных сообщений
+        
+        Из корутин вызывается через asyncio.to_thread, чтобы чтение файлов не блокировало цикл событий.
+        """
         try:
-            discovered = 0
-            exported = 0
+            channels = list(self.channels)
+            # Обнаруженные сообщения = total_messages из метаданных канала
+            discovered = sum(channel.total_messages for channel in channels)
             
-            for channel in self.channels:
-                # Обнаруженные сообщения = total_messages из метаданных канала
-                discovered += channel.total_messages
-                
-                # Подсчитываем экспортированные сообщения из файлов экспорта
-                try:
-                    storage_cfg = self.config_manager.config.storage
-                    base_dir = getattr(storage_cfg, 'export_base_dir', 'exports') or 'exports'
-                except Exception:
-                    base_dir = 'exports'
-                
-                base_path = Path(base_dir)
-                sanitized_title = self._sanitize_channel_filename(channel.title)
-                channel_dir = base_path / sanitized_title
-                json_file = channel_dir / f"{sanitized_title}.json"
-                
-                if json_file.exists():
-                    try:
-                        with open(json_file, 'r', encoding='utf-8') as f:
-                            export_data = json.load(f)
-                        
-                        if isinstance(export_data, list):
-                            exported += len(export_data)
-                        elif isinstance(export_data, dict) and 'messages' in export_data:
-                            exported += len(export_data['messages'])
-                    except Exception as e:
-                        self.logger.debug(f"Error reading export file for {channel.title}: {e}")
+            # Экспортированные сообщения подсчитываются по файлам экспорта.
+            # Счётчики кэшируются по размеру и времени изменения файла, поэтому
+            # после экспорта одного канала заново читается только его файл
+            exported = sum(map(self._count_exported_messages, channels))
             
             # Обновляем статистику
             self.stats.discovered_messages = discovered
@@ -1497,6 +1807,46 @@ class TelegramExporter:
             self.stats.discovered_messages = 0
             self.stats.exported_messages = 0
     
+    def _count_md_headers(self, md_file: Path) -> int:
+        """Подсчитывает заголовки сообщений ("## Сообщение #123") в MD файле
+        
+        Файл читается блоками по _MD_READ_CHUNK_SIZE байт, поэтому память не зависит
+        от размера файла. Вместо регулярного выражения ищет маркер "\\n## " через
+        bytes.find и проверяет префикс заголовка и первую цифру номера по смещению.
+        Хвост блока, в котором заголовок мог оборваться, переносится в следующий блок.
+        """
+        # Сколько байт нужно после начала маркера, чтобы проверить заголовок целиком
+        header_len = len(_MD_HEADER_MARKER) + max(map(len, _MD_HEADER_PREFIXES)) + 1
+        count = 0
+        tail = b'\n'  # Заголовок в начале файла тоже предваряется переводом строки
+        with open(md_file, 'rb') as f:
+            while True:
+                chunk = f.read(_MD_READ_CHUNK_SIZE)
+                window = tail + chunk
+                # На последнем блоке проверяем все маркеры, иначе - только поместившиеся целиком
+                limit = len(window) if not chunk else max(len(window) - header_len + 1, 0)
+                count += self._count_md_headers_in(window, limit)
+                if not chunk:
+                    return count
+                tail = window[limit:]
+    
+    @staticmethod
+    def _count_md_headers_in(data: bytes, limit: int) -> int:
+        """Подсчитывает заголовки сообщений, маркер которых начинается до смещения limit"""
+        count = 0
+        marker_len = len(_MD_HEADER_MARKER)
+        pos = data.find(_MD_HEADER_MARKER, 0, limit + marker_len - 1)
+        while pos != -1:
+            start = pos + marker_len
+            for prefix in _MD_HEADER_PREFIXES:
+                if data.startswith(prefix, start):
+                    digit_pos = start + len(prefix)
+                    if digit_pos < len(data) and 48 <= data[digit_pos] <= 57:
+                        count += 1
+                    break
+            pos = data.find(_MD_HEADER_MARKER, start, limit + marker_len - 1)
+        return count
+    
     def _verify_md_file_count(self, channel: ChannelInfo) -> tuple[bool, int, str]:
         """Проверяет количество сообщений в MD файле канала
         
@@ -1509,16 +1859,9 @@ class TelegramExporter:
         """
         try:
             # Получаем путь к MD файлу
-            try:
-                storage_cfg = self.config_manager.config.storage
-                base_dir = getattr(storage_cfg, 'export_base_dir', 'exports') or 'exports'
-            except Exception:
-                base_dir = 'exports'
+            base_path = self._base_path
             
-            base_path = Path(base_dir)
-            sanitized_title = self._sanitize_channel_filename(channel.title)
-            channel_dir = base_path / sanitized_title
-            md_file = channel_dir / f"{sanitized_title}.md"
+            md_file = self._get_channel_md_path(channel, base_path)
             
             # Проверяем существование MD файла
             if not md_file.exists():
@@ -1527,14 +1870,14 @@ class TelegramExporter:
             
             # Читаем MD файл и подсчитываем количество сообщений
             try:
-                with open(md_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Используем регулярное выражение для поиска заголовков сообщений
-                # Паттерн для поиска строк вида "## Сообщение #123" или "## Message #123"
-                message_pattern = r'^## (?:Сообщение|Message) #\d+'
-                messages_found = re.findall(message_pattern, content, re.MULTILINE)
-                actual_count = len(messages_found)
+                # Если файл не менялся с прошлой проверки, используем сохранённый результат
+                st = md_file.stat()
+                cached = self._md_verify_cache.get(channel.title)
+                if cached and cached[:2] == (st.st_size, st.st_mtime_ns):
+                    actual_count = cached[2]
+                else:
+                    actual_count = self._count_md_headers(md_file)
+                    self._md_verify_cache[channel.title] = (st.st_size, st.st_mtime_ns, actual_count)
                 
                 # Сравниваем с ожидаемым количеством
                 expected_count = channel.total_messages
@@ -1571,21 +1914,30 @@ class TelegramExporter:
             title="Дополнительные действия", box=box.ROUNDED
         ))
         
-        action = Prompt.ask("Выберите действие", choices=["config", "start"], default="start")
+        action = await self._ask(Prompt, "Выберите действие", choices=["config", "start"], default="start")
         
         if action == "config":
-            self.configure_export_types()
+            await self.configure_export_types()
         # Для "start" продолжаем выполнение
     
-    async def run_scheduler(self):
-        """Запуск планировщика задач"""
+    def setup_scheduler(self):
+        """Регистрация задач планировщика"""
         # Планируем ежедневную проверку в 6:00 по Московскому времени (MSK = UTC+3)
         # Schedule for 3:00 UTC which is 6:00 MSK
         schedule.every().day.at("03:00").do(lambda: asyncio.create_task(self._daily_check_new_messages()))
+    
+    def run_scheduled_jobs(self) -> float:
+        """Выполнение наступивших задач планировщика
         
-        while self.running:
-            schedule.run_pending()
-            await asyncio.sleep(60)  # Проверка каждую минуту
+        Returns:
+            float: Через сколько секунд нужно проверить задачи снова
+        """
+        schedule.run_pending()
+        idle = schedule.idle_seconds()
+        if idle is None:
+            return self.SCHEDULER_MAX_SLEEP
+        # Ограничиваем ожидание сверху, чтобы учитывать переводы системных часов
+        return min(max(idle, 1.0), self.SCHEDULER_MAX_SLEEP)
     
     def scroll_channels_up(self):
         """Прокрутка списка каналов вверх"""
@@ -1598,11 +1950,48 @@ class TelegramExporter:
         if self.channels_scroll_offset < max_offset:
             self.channels_scroll_offset = min(max_offset, self.channels_scroll_offset + self.channels_display_limit)
     
-    def configure_export_types(self):
+    async def _run_prompt(self, func, *args, **kwargs):
+        """Запуск блокирующего чтения stdin в daemon-потоке
+        
+        asyncio.to_thread не подходит: поток пула нельзя прервать, и после Ctrl+C
+        завершение цикла событий ждало бы ввода. Daemon-поток не держит выход процесса.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        def deliver(setter, value):
+            if not future.done():
+                setter(value)
+        
+        def worker():
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                callback = (future.set_exception, e)
+            else:
+                callback = (future.set_result, result)
+            try:
+                loop.call_soon_threadsafe(deliver, *callback)
+            except RuntimeError:
+                # Цикл событий уже закрыт (выход по Ctrl+C)
+                pass
+        
+        threading.Thread(target=worker, name="prompt", daemon=True).start()
+        return await future
+    
+    async def _await_enter(self, prompt: str = "Нажмите Enter для продолжения..."):
+        """Ожидание Enter в отдельном потоке, чтобы фоновые задачи не простаивали"""
+        await self._run_prompt(input, prompt)
+    
+    async def _ask(self, prompt_cls, *args, **kwargs):
+        """Вопрос через Prompt/Confirm в отдельном потоке, чтобы не блокировать цикл событий"""
+        return await self._run_prompt(prompt_cls.ask, *args, **kwargs)
+    
+    async def configure_export_types(self):
         """Настройка типов экспорта для каналов с дополнительными возможностями"""
         if not self.channels:
             self.console.print("[bright_red]Нет выбранных каналов[/bright_red]")
-            input("Нажмите Enter для продолжения...")
+            await self._await_enter()
             return
         
         self.console.clear()
@@ -1612,25 +2001,30 @@ class TelegramExporter:
         ))
         
         # Отображаем список каналов с текущими настройками
-        table = Table(box=box.ROUNDED)
-        table.add_column("№", style="cyan", width=4)
-        table.add_column("Канал", style="green")
-        table.add_column("Тип экспорта", style="yellow")
-        
-        export_type_names = {
-            ExportType.BOTH: "Сообщения и файлы",
-            ExportType.MESSAGES_ONLY: "Только сообщения",
-            ExportType.FILES_ONLY: "Только файлы"
-        }
-        
-        for i, channel in enumerate(self.channels, 1):
-            table.add_row(
-                str(i),
-                channel.title[:40] + "..." if len(channel.title) > 40 else channel.title,
-                export_type_names[channel.export_type]
-            )
+        # (таблица строится заново только при изменении списка или типов экспорта)
+        state = tuple((channel.title, channel.export_type) for channel in self.channels)
+        cached = self._channels_table_cache.get('export_types')
+        if cached is None or cached[0] != state:
+            table = Table(box=box.ROUNDED)
+            table.add_column("№", style="cyan", width=4)
+            table.add_column("Канал", style="green")
+            table.add_column("Тип экспорта", style="yellow")
+            
+            export_type_names = {
+                ExportType.BOTH: "Сообщения и файлы",
+                ExportType.MESSAGES_ONLY: "Только сообщения",
+                ExportType.FILES_ONLY: "Только файлы"
+            }
+            
+            for i, channel in enumerate(self.channels, 1):
+                table.add_row(
+                    str(i),
+                    channel.title[:40] + "..." if len(channel.title) > 40 else channel.title,
+                    export_type_names[channel.export_type]
+                )
+            cached = self._channels_table_cache['export_types'] = (state, table)
         
-        self.console.print(table)
+        self.console.print(cached[1])
         
         self.console.print("\n[bright_blue]Команды:[/bright_blue]")
         self.console.print("1 - Изменить тип экспорта конкретного канала")
@@ -1639,28 +2033,28 @@ class TelegramExporter:
         self.console.print("4 - [новое] Переэкспортировать конкретный канал в Markdown")
         self.console.print("q - Вернуться к главному экрану")
         
-        choice = Prompt.ask("Выберите действие").strip().lower()
+        choice = (await self._ask(Prompt, "Выберите действие")).strip().lower()
         
         if choice == "1":
-            self._configure_single_channel_export_type()
+            await self._configure_single_channel_export_type()
         elif choice == "2":
-            self._configure_all_channels_export_type()
+            await self._configure_all_channels_export_type()
         elif choice == "3":
-            asyncio.create_task(self._reexport_all_channels_to_markdown())
+            await self._reexport_all_channels_to_markdown()
         elif choice == "4":
-            self._reexport_single_channel_to_markdown()
+            await self._reexport_single_channel_to_markdown()
         elif choice == "q":
             return
         else:
             self.console.print("[bright_red]Неверная команда[/bright_red]")
-            input("Нажмите Enter для продолжения...")
+            await self._await_enter()
     
-    def _configure_single_channel_export_type(self):
+    async def _configure_single_channel_export_type(self):
         """Настройка типа экспорта для одного канала"""
         try:
-            channel_num = int(Prompt.ask("Введите номер канала")) - 1
+            channel_num = int(await self._ask(Prompt, "Введите номер канала")) - 1
             if 0 <= channel_num < len(self.channels):
-                new_type = self._choose_export_type()
+                new_type = await self._choose_export_type()
                 if new_type:
                     self.channels[channel_num].export_type = new_type
                     self.save_channels()
@@ -1670,27 +2064,27 @@ class TelegramExporter:
         except ValueError:
             self.console.print("[bright_red]Неверный формат номера[/bright_red]")
         
-        input("Нажмите Enter для продолжения...")
+        await self._await_enter()
     
-    def _configure_all_channels_export_type(self):
+    async def _configure_all_channels_export_type(self):
         """Настройка одинакового типа экспорта для всех каналов"""
-        new_type = self._choose_export_type()
+        new_type = await self._choose_export_type()
         if new_type:
             for channel in self.channels:
                 channel.export_type = new_type
             self.save_channels()
             self.console.print("[bright_green]Тип экспорта обновлен для всех каналов[/bright_green]")
         
-        input("Нажмите Enter для продолжения...")
+        await self._await_enter()
     
-    def _choose_export_type(self) -> Optional[ExportType]:
+    async def _choose_export_type(self) -> Optional[ExportType]:
         """Выбор типа экспорта"""
         self.console.print("\nВыберите тип экспорта:")
         self.console.print("1 - Сообщения и файлы (по умолчанию)")
         self.console.print("2 - Только сообщения (без загрузки файлов)")
         self.console.print("3 - Только файлы (без текста сообщений)")
         
-        choice = Prompt.ask("Ваш выбор").strip()
+        choice = (await self._ask(Prompt, "Ваш выбор")).strip()
         
         if choice == "1":
             return ExportType.BOTH
@@ -1704,7 +2098,7 @@ class TelegramExporter:
     
     async def _reexport_all_channels_to_markdown(self):
         """Переэкспорт всех каналов в Markdown формат"""
-        if not Confirm.ask("Переэкспортировать все каналы в Markdown с перезаписью файлов?", default=False):
+        if not await self._ask(Confirm, "Переэкспортировать все каналы в Markdown с перезаписью файлов?", default=False):
             return
             
         self.console.print("[green]Запуск переэкспорта всех каналов...[/green]")
@@ -1715,7 +2109,9 @@ class TelegramExporter:
         for i, channel in enumerate(self.channels, 1):
             try:
                 self.console.print(f"[blue]Переэкспорт {i}/{len(self.channels)}: {channel.title}[/blue]")
-                await self._reexport_channel_to_markdown(channel)
+                if not await self._reexport_channel(channel, markdown_only=True):
+                    error_count += 1
+                    continue
                 success_count += 1
                 self.console.print(f"[green]✓ Завершен: {channel.title}[/green]")
             except Exception as e:
@@ -1730,116 +2126,24 @@ class TelegramExporter:
         notification = f"📝 Переэкспорт в Markdown завершен\n✓ Успешно: {success_count}\n✗ Ошибок: {error_count}"
         await self.send_notification(notification)
         
-        input("Нажмите Enter для продолжения...")
+        await self._await_enter()
     
-    def _reexport_single_channel_to_markdown(self):
+    async def _reexport_single_channel_to_markdown(self):
         """Переэкспорт конкретного канала в Markdown формат"""
         try:
-            channel_num = int(Prompt.ask("Введите номер канала")) - 1
+            channel_num = int(await self._ask(Prompt, "Введите номер канала")) - 1
             if 0 <= channel_num < len(self.channels):
                 channel = self.channels[channel_num]
-                if Confirm.ask(f"Переэкспортировать '{channel.title}' в Markdown с перезаписью файла?", default=False):
+                if await self._ask(Confirm, f"Переэкспортировать '{channel.title}' в Markdown с перезаписью файла?", default=False):
                     self.console.print(f"[green]Запуск переэкспорта: {channel.title}[/green]")
-                    asyncio.create_task(self._reexport_channel_to_markdown(channel))
+                    asyncio.create_task(self._reexport_channel(channel, markdown_only=True))
                     self.console.print(f"[green]✓ Переэкспорт запущен: {channel.title}[/green]")
             else:
                 self.console.print("[bright_red]Неверный номер канала[/bright_red]")
         except ValueError:
             self.console.print("[bright_red]Неверный формат номера[/bright_red]")
         
-        input("Нажмите Enter для продолжения...")
-    
-    async def _reexport_channel_to_markdown(self, channel: ChannelInfo):
-        """Переэкспорт конкретного канала в Markdown"""
-        try:
-            # Получаем путь к директории канала
-            try:
-                storage_cfg = self.config_manager.config.storage
-                base_dir = getattr(storage_cfg, 'export_base_dir', 'exports') or 'exports'
-            except Exception:
-                base_dir = 'exports'
-            
-            base_path = Path(base_dir)
-            sanitized_title = self._sanitize_channel_filename(channel.title)
-            channel_dir = base_path / sanitized_title
-            
-            # Получаем все сообщения из Telegram API заново
-            self.console.print(f"[blue]Получение сообщений из Telegram для {channel.title}...[/blue]")
-            
-            try:
-                # Получаем Telegram entity
-                entity = await self.client.get_entity(channel.id)
-                
-                # Получаем все сообщения канала
-                messages = []
-                message_count = 0
-                
-                async for message in self.client.iter_messages(entity, limit=None):
-                    # Фильтруем контент
-                    if self.content_filter.should_filter_message(message.text or ""):
-                        continue
-                        
-                    # Обрабатываем медиафайлы
-                    media_type = None
-                    media_path = None
-                    
-                    if message.media:
-                        if isinstance(message.media, MessageMediaPhoto):
-                            media_type = "photo"
-                        elif isinstance(message.media, MessageMediaDocument):
-                            if message.document:
-                                if message.document.mime_type and message.document.mime_type.startswith('image/'):
-                                    media_type = "photo"
-                                elif message.document.mime_type and message.document.mime_type.startswith('video/'):
-                                    media_type = "video"
-                                else:
-                                    media_type = "document"
-                    
-                    # Создаем MessageData
-                    msg_data = MessageData(
-                        id=message.id,
-                        date=message.date,
-                        text=message.text or "",
-                        author=getattr(message.sender, 'username', None) if message.sender else None,
-                        media_type=media_type,
-                        media_path=media_path,
-                        views=getattr(message, 'views', 0) or 0,
-                        forwards=getattr(message, 'forwards', 0) or 0,
-                        replies=getattr(message, 'replies', {}).get('replies', 0) if hasattr(message, 'replies') and message.replies else 0,
-                        edited=message.edit_date
-                    )
-                    messages.append(msg_data)
-                    message_count += 1
-                    
-                    # Показываем прогресс каждые 100 сообщений
-                    if message_count % 100 == 0:
-                        self.console.print(f"[green]Обработано {message_count} сообщений...[/green]")
-                
-                self.console.print(f"[green]Получено {len(messages)} сообщений для реэкспорта[/green]")
-                
-                if not messages:
-                    raise ValueError(f"Не найдено сообщений для реэкспорта канала {channel.title}")
-                
-                # Сортируем сообщения по ID (старые сначала)
-                messages.sort(key=lambda x: x.id)
-                
-                # Создаем Markdown экспортер и перезаписываем файл
-                md_exporter = MarkdownExporter(channel.title, channel_dir)
-                md_file = md_exporter.export_messages(messages, append_mode=False)  # append_mode=False для перезаписи
-                
-                if md_file and Path(md_file).exists():
-                    self.logger.info(f"Successfully reexported {channel.title} to Markdown: {md_file}")
-                    self.console.print(f"[green]✓ Переэкспорт в Markdown завершен: {md_file}[/green]")
-                else:
-                    raise RuntimeError(f"Не удалось создать Markdown файл для {channel.title}")
-                    
-            except Exception as e:
-                self.logger.error(f"Error getting messages from Telegram for {channel.title}: {e}")
-                raise
-            
-        except Exception as e:
-            self.logger.error(f"Error reexporting {channel.title} to Markdown: {e}")
-            raise
+        await self._await_enter()
     
     async def _handle_reexport_channels(self):
         """Обработка переэкспорта сообщений каналов с перезаписью"""
@@ -1854,19 +2158,24 @@ class TelegramExporter:
         ))
         
         # Отображаем список каналов
-        table = Table(box=box.ROUNDED)
-        table.add_column("№", style="cyan", width=4)
-        table.add_column("Канал", style="green")
-        table.add_column("Сообщений", style="yellow", justify="right")
-        
-        for i, channel in enumerate(self.channels, 1):
-            table.add_row(
-                str(i),
-                channel.title[:50] + "..." if len(channel.title) > 50 else channel.title,
-                str(channel.total_messages)
-            )
+        # (таблица строится заново только при изменении списка или числа сообщений)
+        state = tuple((channel.title, channel.total_messages) for channel in self.channels)
+        cached = self._channels_table_cache.get('reexport')
+        if cached is None or cached[0] != state:
+            table = Table(box=box.ROUNDED)
+            table.add_column("№", style="cyan", width=4)
+            table.add_column("Канал", style="green")
+            table.add_column("Сообщений", style="yellow", justify="right")
+            
+            for i, channel in enumerate(self.channels, 1):
+                table.add_row(
+                    str(i),
+                    channel.title[:50] + "..." if len(channel.title) > 50 else channel.title,
+                    str(channel.total_messages)
+                )
+            cached = self._channels_table_cache['reexport'] = (state, table)
         
-        self.console.print(table)
+        self.console.print(cached[1])
         
         self.console.print("\n[bright_blue]Варианты переэкспорта:[/bright_blue]")
         self.console.print("1 - Переэкспортировать все каналы в все форматы")
@@ -1875,7 +2184,7 @@ class TelegramExporter:
         self.console.print("4 - Переэкспортировать конкретный канал только в Markdown")
         self.console.print("q - Вернуться к главному меню")
         
-        choice = Prompt.ask("Выберите действие").strip().lower()
+        choice = (await self._ask(Prompt, "Выберите действие")).strip().lower()
         
         if choice == "1":
             await self._reexport_all_channels_all_formats()
@@ -1889,11 +2198,11 @@ class TelegramExporter:
             return
         else:
             self.console.print("[bright_red]Неверная команда[/bright_red]")
-            input("Нажмите Enter для продолжения...")
+            await self._await_enter()
     
     async def _reexport_all_channels_all_formats(self):
         """Переэкспорт всех каналов во все форматы"""
-        if not Confirm.ask("Переэкспортировать все каналы в JSON, HTML и Markdown с перезаписью файлов?", default=False):
+        if not await self._ask(Confirm, "Переэкспортировать все каналы в JSON, HTML и Markdown с перезаписью файлов?", default=False):
             return
             
         self.console.print("[green]Запуск полного переэкспорта всех каналов...[/green]")
@@ -1904,7 +2213,9 @@ class TelegramExporter:
         for i, channel in enumerate(self.channels, 1):
             try:
                 self.console.print(f"[blue]Переэкспорт {i}/{len(self.channels)}: {channel.title}[/blue]")
-                await self._reexport_channel_to_all_formats(channel)
+                if not await self._reexport_channel(channel):
+                    error_count += 1
+                    continue
                 success_count += 1
                 self.console.print(f"[green]✓ Завершен: {channel.title}[/green]")
             except Exception as e:
@@ -1919,55 +2230,62 @@ class TelegramExporter:
         notification = f"📋 Полный переэкспорт в все форматы завершен\n✓ Успешно: {success_count}\n✗ Ошибок: {error_count}"
         await self.send_notification(notification)
         
-        input("Нажмите Enter для продолжения...")
+        await self._await_enter()
     
     async def _reexport_single_channel_all_formats(self):
         """Переэкспорт конкретного канала во все форматы"""
         try:
-            channel_num = int(Prompt.ask("Введите номер канала")) - 1
+            channel_num = int(await self._ask(Prompt, "Введите номер канала")) - 1
             if 0 <= channel_num < len(self.channels):
                 channel = self.channels[channel_num]
-                if Confirm.ask(f"Переэкспортировать '{channel.title}' в JSON, HTML и Markdown с перезаписью файлов?", default=False):
+                if await self._ask(Confirm, f"Переэкспортировать '{channel.title}' в JSON, HTML и Markdown с перезаписью файлов?", default=False):
                     self.console.print(f"[green]Запуск полного переэкспорта: {channel.title}[/green]")
-                    await self._reexport_channel_to_all_formats(channel)
-                    self.console.print(f"[green]✓ Полный переэкспорт завершен: {channel.title}[/green]")
+                    if await self._reexport_channel(channel):
+                        self.console.print(f"[green]✓ Полный переэкспорт завершен: {channel.title}[/green]")
             else:
                 self.console.print("[bright_red]Неверный номер канала[/bright_red]")
         except ValueError:
             self.console.print("[bright_red]Неверный формат номера[/bright_red]")
         
-        input("Нажмите Enter для продолжения...")
+        await self._await_enter()
     
     async def _reexport_single_channel_to_markdown_from_menu(self):
         """Переэкспорт конкретного канала в Markdown формат из меню"""
         try:
-            channel_num = int(Prompt.ask("Введите номер канала")) - 1
+            channel_num = int(await self._ask(Prompt, "Введите номер канала")) - 1
             if 0 <= channel_num < len(self.channels):
                 channel = self.channels[channel_num]
-                if Confirm.ask(f"Переэкспортировать '{channel.title}' в Markdown с перезаписью файла?", default=False):
+                if await self._ask(Confirm, f"Переэкспортировать '{channel.title}' в Markdown с перезаписью файла?", default=False):
                     self.console.print(f"[green]Запуск переэкспорта: {channel.title}[/green]")
-                    await self._reexport_channel_to_markdown(channel)
-                    self.console.print(f"[green]✓ Переэкспорт завершен: {channel.title}[/green]")
+                    if await self._reexport_channel(channel, markdown_only=True):
+                        self.console.print(f"[green]✓ Переэкспорт завершен: {channel.title}[/green]")
             else:
                 self.console.print("[bright_red]Неверный номер канала[/bright_red]")
         except ValueError:
             self.console.print("[bright_red]Неверный формат номера[/bright_red]")
         
-        input("Нажмите Enter для продолжения...")
+        await self._await_enter()
     
-    async def _reexport_channel_to_all_formats(self, channel: ChannelInfo):
-        """Переэкспорт конкретного канала во все форматы"""
+    async def _reexport_channel(self, channel: ChannelInfo, markdown_only: bool = False) -> bool:
+        """Переэкспорт конкретного канала во все форматы или только в Markdown
+        
+        Args:
+            channel: Канал для переэкспорта
+            markdown_only: Перезаписать только Markdown файл
+            
+        Returns:
+            bool: False, если канал уже экспортируется другой задачей
+        """
+        if not self._claim_channel_export(channel):
+            self.console.print(f"[yellow]Канал {channel.title} уже экспортируется, переэкспорт пропущен[/yellow]")
+            return False
+        formats_label = "Markdown" if markdown_only else "all formats"
         try:
             # Получаем путь к директории канала
-            try:
-                storage_cfg = self.config_manager.config.storage
-                base_dir = getattr(storage_cfg, 'export_base_dir', 'exports') or 'exports'
-            except Exception:
-                base_dir = 'exports'
-            
-            base_path = Path(base_dir)
-            sanitized_title = self._sanitize_channel_filename(channel.title)
+            base_path = self._base_path
+            sanitized_title = self._get_sanitized_title(channel)
             channel_dir = base_path / sanitized_title
+            self._md_verify_cache.pop(channel.title, None)
             
             # Получаем все сообщения из Telegram API заново
             self.console.print(f"[blue]Получение сообщений из Telegram для {channel.title}...[/blue]")
@@ -2011,7 +2329,7 @@ class TelegramExporter:
                         media_path=media_path,
                         views=getattr(message, 'views', 0) or 0,
                         forwards=getattr(message, 'forwards', 0) or 0,
-                        replies=getattr(message, 'replies', {}).get('replies', 0) if hasattr(message, 'replies') and message.replies else 0,
+                        replies=_message_replies_count(message),
                         edited=message.edit_date
                     )
                     messages.append(msg_data)
@@ -2029,26 +2347,22 @@ class TelegramExporter:
                 # Сортируем сообщения по ID (старые сначала)
                 messages.sort(key=lambda x: x.id)
                 
-                # Экспортируем в JSON (перезаписываем)
-                json_exporter = JSONExporter(channel.title, channel_dir)
-                json_file = json_exporter.export_messages(messages, append_mode=False)
+                # Экспортируем в выбранные форматы (перезаписываем)
+                exporter_classes = [(MarkdownExporter, "Markdown")]
+                if not markdown_only:
+                    exporter_classes = [(JSONExporter, "JSON"), (HTMLExporter, "HTML")] + exporter_classes
                 
-                # Экспортируем в HTML (перезаписываем)
-                html_exporter = HTMLExporter(channel.title, channel_dir)
-                html_file = html_exporter.export_messages(messages, append_mode=False)
-                
-                # Экспортируем в Markdown (перезаписываем)
-                md_exporter = MarkdownExporter(channel.title, channel_dir)
-                md_file = md_exporter.export_messages(messages, append_mode=False)
+                # Форматы пишутся параллельно в рабочих потоках, не блокируя цикл событий
+                exported_files = await asyncio.gather(*(
+                    asyncio.to_thread(exporter_class(channel.title, channel_dir).export_messages, messages, append_mode=False)
+                    for exporter_class, _ in exporter_classes
+                ))
                 
-                # Проверяем успешность экспорта
                 files_created = []
-                if json_file and Path(json_file).exists():
-                    files_created.append("JSON")
-                if html_file and Path(html_file).exists():
-                    files_created.append("HTML")
-                if md_file and Path(md_file).exists():
-                    files_created.append("Markdown")
+                for exported_file, (_, format_name) in zip(exported_files, exporter_classes):
+                    # Проверяем успешность экспорта
+                    if exported_file and Path(exported_file).exists():
+                        files_created.append(format_name)
                 
                 if files_created:
                     self.logger.info(f"Successfully reexported {channel.title} to formats: {', '.join(files_created)}")
@@ -2061,8 +2375,11 @@ class TelegramExporter:
                 raise
             
         except Exception as e:
-            self.logger.error(f"Error reexporting {channel.title} to all formats: {e}")
+            self.logger.error(f"Error reexporting {channel.title} to {formats_label}: {e}")
             raise
+        finally:
+            self._release_channel_export(channel)
+        return True
 
 
 
@@ -2089,7 +2406,12 @@ class TelegramExporter:
                     diagnosis = await self._diagnose_channel_issues(channel)
                     self.logger.info(f"Диагностика канала {channel.title}: {diagnosis['issues']}")
                     
-                    new_count = await self._check_and_append_new_messages(channel)
+                    if not self._claim_channel_export(channel):
+                        continue
+                    try:
+                        new_count = await self._check_and_append_new_messages(channel)
+                    finally:
+                        self._release_channel_export(channel)
                     if new_count > 0:
                         new_messages_summary[channel.title] = new_count
                         total_new_messages += new_count
@@ -2158,14 +2480,8 @@ class TelegramExporter:
             self.logger.info(f"Проверка новых сообщений для канала: {channel.title}")
             
             # Получаем путь к директории канала
-            try:
-                storage_cfg = self.config_manager.config.storage
-                base_dir = getattr(storage_cfg, 'export_base_dir', 'exports') or 'exports'
-            except Exception:
-                base_dir = 'exports'
-            
-            base_path = Path(base_dir)
-            sanitized_title = self._sanitize_channel_filename(channel.title)
+            base_path = self._base_path
+            sanitized_title = self._get_sanitized_title(channel)
             channel_dir = base_path / sanitized_title
             
             # Создаем директорию если не существует
@@ -2265,12 +2581,7 @@ class TelegramExporter:
                                     media_type = "document"
                     
                     # Создание объекта данных сообщения
-                    replies_count = 0
-                    if hasattr(message, 'replies') and message.replies:
-                        if hasattr(message.replies, 'replies'):
-                            replies_count = message.replies.replies
-                        elif hasattr(message.replies, 'replies_pts'):
-                            replies_count = getattr(message.replies, 'replies_pts', 0)
+                    replies_count = _message_replies_count(message)
                     
                     msg_data = MessageData(
                         id=message.id,
@@ -2300,7 +2611,7 @@ class TelegramExporter:
                 
                 # Создаем Markdown экспортер и добавляем новые сообщения в существующий файл
                 md_exporter = MarkdownExporter(channel.title, channel_dir)
-                md_file = md_exporter.export_messages(new_messages, append_mode=True)
+                md_file = await asyncio.to_thread(md_exporter.export_messages, new_messages, append_mode=True)
                 
                 if md_file and Path(md_file).exists():
                     self.logger.info(f"Успешно добавлено {len(new_messages)} сообщений в MD файл для канала {channel.title}")
@@ -2313,7 +2624,7 @@ class TelegramExporter:
                     
                     # Обновляем статистику канала
                     channel.total_messages += len(new_messages)
-                    channel.last_check = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    self._touch_last_check(channel)
                     
                     # Сохраняем обновленную информацию о каналах
                     self.save_channels()
@@ -2325,7 +2636,7 @@ class TelegramExporter:
             else:
                 self.logger.info(f"Нет новых сообщений для канала {channel.title}")
                 # Обновляем время последней проверки
-                channel.last_check = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self._touch_last_check(channel)
                 self.save_channels()
                 return 0
                 
@@ -2349,39 +2660,42 @@ class TelegramExporter:
 📢 <b>Ежедневная проверка новых сообщений завершена</b>
 
 📊 <b>Всего новых сообщений:</b> {total_new_messages}
-📅 <b>Время проверки:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+📅 <b>Время проверки:</b> {self._now_str()}
 
 {channels_text}
 
 📁 Новые сообщения добавлены в соответствующие MD файлы
         """.strip()
     
-    async def export_channel(self, channel: ChannelInfo):
-        """Экспорт конкретного канала"""
+    async def export_channel(self, channel: ChannelInfo, *, now: Optional[datetime] = None):
+        """Экспорт конкретного канала
+        
+        Args:
+            channel: Канал для экспорта
+            now: Время проверки канала; при экспорте всех каналов передаётся одно значение на проход
+        """
+        if now is None:
+            now = datetime.now()
         try:
             self.logger.info(f"Starting export for channel: {channel.title}")
             
-            # Обнуляем счетчик повторных экспортов MD перед новым экспортом
-            if not hasattr(channel, '_force_full_reexport') or not channel._force_full_reexport:
+            # Обнуляем счетчик повторных экспортов MD этого канала перед новым экспортом
+            if not channel.force_full_reexport:
                 # Сбрасываем счетчик только для новых экспортов (не для ре-экспортов)
-                self.stats.md_reexport_count = 0
+                self._md_reexport_attempts.pop(channel.title, None)
             
             # Обновляем информацию о текущем экспорте
-            self.stats.current_export_info = f"Экспорт: {channel.title}"
+            self._set_export_info(channel, f"Экспорт: {channel.title}")
             self.stats.current_channel_name = channel.title
             self.stats.last_exported_message_id = channel.last_message_id
+            self._mark_ui_dirty()
             
-            # Создание директории для канала (учет базового каталога из настроек)
-            try:
-                storage_cfg = self.config_manager.config.storage  # type: ignore[attr-defined]
-                base_dir = getattr(storage_cfg, 'export_base_dir', 'exports') or 'exports'
-            except Exception:
-                base_dir = 'exports'
-            base_path = Path(base_dir)
-            base_path.mkdir(parents=True, exist_ok=True)
-            sanitized_title = self._sanitize_channel_filename(channel.title)
+            # Создание директории для канала (учет базового каталога из настроек;
+            # базовый каталог при необходимости создаётся тем же вызовом mkdir)
+            base_path = self._base_path
+            sanitized_title = self._get_sanitized_title(channel)
             channel_dir = base_path / sanitized_title
-            channel_dir.mkdir(exist_ok=True)
+            channel_dir.mkdir(parents=True, exist_ok=True)
             
             # Получение канала
             try:
@@ -2401,7 +2715,7 @@ class TelegramExporter:
                 channel.last_message_id = 0
                 channel.total_messages = 0
                 # Отмечаем для принудительного полного экспорта
-                channel._force_full_reexport = True
+                channel.force_full_reexport = True
                 # Обновляем статистику
                 self.stats.md_verification_status = "Обнаружен отсутствующий MD файл"
                 self.stats.md_verification_channel = channel.title
@@ -2411,7 +2725,7 @@ class TelegramExporter:
             total_messages_in_channel = 0
             try:
                 # При принудительном полном ре-экспорте или отсутствии MD файла получаем реальное количество сообщений
-                if md_file_missing or (hasattr(channel, '_force_full_reexport') and channel._force_full_reexport):
+                if md_file_missing or channel.force_full_reexport:
                     if md_file_missing:
                         self.logger.info(f"Отсутствует MD файл: подсчитываем реальное количество сообщений в {channel.title}")
                         self.stats.md_verification_progress = f"Подсчет сообщений в {channel.title}"
@@ -2437,7 +2751,7 @@ class TelegramExporter:
                         total_messages_in_channel = message_count
                         self.logger.info(f"Реальное количество сообщений в {channel.title}: {total_messages_in_channel}")
                         # Обновляем кэшированное значение - только при отсутствии MD файла или принудительном реэкспорте
-                        if md_file_missing or (hasattr(channel, '_force_full_reexport') and channel._force_full_reexport):
+                        if md_file_missing or channel.force_full_reexport:
                             channel.total_messages = total_messages_in_channel
                         
                         if md_file_missing:
@@ -2489,6 +2803,7 @@ class TelegramExporter:
                     self.stats.download_speed_files_per_sec = float(progress.get('files_per_sec', 0.0))
                     self.stats.download_speed_mb_per_sec = float(progress.get('mb_per_sec', 0.0))
                     self.stats.remaining_files_to_download = int(progress.get('remaining', 0))
+                    self._mark_ui_dirty()
                     # Убираем строку, которая дописывала информацию - 
                     # это уже обрабатывается в _create_detailed_statistics с правильным форматированием
                 except Exception:
@@ -2533,7 +2848,9 @@ class TelegramExporter:
                         for message in messages_to_process:
                             try:
                                 # Обновляем прогресс экспорта
-                                self.stats.current_export_info = f"Экспорт: {channel.title} | Обработано {len(messages_data)} из {total_messages_in_channel}"
+                                self._set_export_info(channel, f"Экспорт: {channel.title} | Обработано {len(messages_data)} из {total_messages_in_channel}")
+                                if len(messages_data) % self.PROGRESS_UPDATE_INTERVAL == 0:
+                                    self._mark_ui_dirty()
                                 
                                 # Фильтрация рекламных и промо-сообщений
                                 should_filter, filter_reason = self.content_filter.should_filter_message(message.text or "")
@@ -2560,12 +2877,7 @@ class TelegramExporter:
                                 
                                 # Создание объекта данных сообщения
                                 # Безопасное получение количества ответов
-                                replies_count = 0
-                                if hasattr(message, 'replies') and message.replies:
-                                    if hasattr(message.replies, 'replies'):
-                                        replies_count = message.replies.replies
-                                    elif hasattr(message.replies, 'replies_pts'):
-                                        replies_count = getattr(message.replies, 'replies_pts', 0)
+                                replies_count = _message_replies_count(message)
                                 
                                 msg_data = MessageData(
                                     id=message.id,
@@ -2596,7 +2908,9 @@ class TelegramExporter:
                     async for message in self.client.iter_messages(entity, min_id=min_id):
                         try:
                             # Обновляем прогресс экспорта
-                            self.stats.current_export_info = f"Экспорт: {channel.title} | Обработано {len(messages_data)} из {total_messages_in_channel}"
+                            self._set_export_info(channel, f"Экспорт: {channel.title} | Обработано {len(messages_data)} из {total_messages_in_channel}")
+                            if len(messages_data) % self.PROGRESS_UPDATE_INTERVAL == 0:
+                                self._mark_ui_dirty()
                             
                             # Фильтрация рекламных и промо-сообщений
                             should_filter, filter_reason = self.content_filter.should_filter_message(message.text or "")
@@ -2623,12 +2937,7 @@ class TelegramExporter:
                             
                             # Создание объекта данных сообщения
                             # Безопасное получение количества ответов
-                            replies_count = 0
-                            if hasattr(message, 'replies') and message.replies:
-                                if hasattr(message.replies, 'replies'):
-                                    replies_count = message.replies.replies
-                                elif hasattr(message.replies, 'replies_pts'):
-                                    replies_count = getattr(message.replies, 'replies_pts', 0)
+                            replies_count = _message_replies_count(message)
                             
                             msg_data = MessageData(
                                 id=message.id,
@@ -2657,12 +2966,14 @@ class TelegramExporter:
             
             except FloodWaitError as e:
                 # Используем итеративный подход вместо рекурсии
-                retry_count = getattr(self, '_floodwait_retry_count', 0)
+                retry_count = self._floodwait_retries.get(channel.title, 0)
                 max_retries = 3
                 
                 if retry_count >= max_retries:
                     self.logger.error(f"Максимум попыток ({max_retries}) превышен для канала {channel.title}")
                     self.stats.export_errors += 1
+                    # Сбрасываем счетчик, чтобы следующий проход начал попытки заново
+                    self._floodwait_retries.pop(channel.title, None)
                     return
                     
                 wait_time = min(e.seconds, 300)  # Максимум 5 минут ожидания
@@ -2670,18 +2981,18 @@ class TelegramExporter:
                 await asyncio.sleep(wait_time)
                 
                 # Увеличиваем счетчик попыток
-                self._floodwait_retry_count = retry_count + 1
+                self._floodwait_retries[channel.title] = retry_count + 1
                 
                 # Повторная попытка (итеративно)
                 # Устанавливаем флаг, чтобы предотвратить отправку уведомлений во время рекурсивного вызова
-                original_in_md_verification = getattr(self, '_in_md_verification', False)
-                self._in_md_verification = True
+                original_in_md_verification = channel.in_md_verification
+                channel.in_md_verification = True
                 
                 try:
                     await self.export_channel(channel)
                 finally:
                     # Восстанавливаем оригинальное значение флага
-                    self._in_md_verification = original_in_md_verification
+                    channel.in_md_verification = original_in_md_verification
                 
                 return
             except Exception as e:
@@ -2703,7 +3014,7 @@ class TelegramExporter:
                 md_file_path = md_exporter.output_dir / f"{md_exporter.sanitize_filename(md_exporter.channel_name)}.md"
                 
                 # Проверяем, есть ли флаг принудительного полного ре-экспорта
-                if hasattr(channel, '_force_full_reexport') and channel._force_full_reexport:
+                if channel.force_full_reexport:
                     export_mode = "initial"
                     self.logger.info(f"Forced full re-export mode for {channel.title} - recreating all files from scratch")
                 elif not json_file_path.exists() or not html_file_path.exists() or not md_file_path.exists():
@@ -2714,7 +3025,8 @@ class TelegramExporter:
                 if media_downloader.get_queue_size() > 0:
                     queue_size = media_downloader.get_queue_size()
                     self.logger.info(f"Starting intelligent download of {queue_size} media files")
-                    self.stats.current_export_info = f"Интеллектуальная загрузка: {channel.title} | {queue_size} файлов"
+                    self._set_export_info(channel, f"Интеллектуальная загрузка: {channel.title} | {queue_size} файлов")
+                    self._mark_ui_dirty()
                     
                     try:
                         downloaded_files = await media_downloader.download_queue_parallel()
@@ -2731,6 +3043,14 @@ class TelegramExporter:
                                        f"{stats['flood_waits']} flood waits, "
                                        f"{stats['average_speed']:.1f} files/sec")
                         
+                        # Размеры файлов в папке media получаем одним проходом os.scandir
+                        # вместо exists() и stat() для каждого сообщения
+                        try:
+                            with os.scandir(channel_dir / "media") as entries:
+                                media_sizes = {entry.name: entry.stat().st_size for entry in entries if entry.is_file()}
+                        except OSError:
+                            media_sizes = {}
+                        
                         # Обновляем пути к медиафайлам в данных сообщений
                         for msg_data in messages_data:
                             if msg_data.media_path and msg_data.media_path.startswith("media/"):
@@ -2738,11 +3058,11 @@ class TelegramExporter:
                                 actual_path = media_downloader.get_downloaded_file(msg_data.id)
                                 if actual_path:
                                     # Проверяем, что файл действительно существует и имеет размер больше 0
-                                    full_path = channel_dir / actual_path
-                                    if full_path.exists() and full_path.stat().st_size > 0:
+                                    size_bytes = media_sizes.get(posixpath.basename(actual_path), 0)
+                                    if size_bytes > 0:
                                         msg_data.media_path = actual_path
                                         # Подсчитываем размер файла
-                                        file_size = media_downloader.get_file_size_mb(actual_path)
+                                        file_size = size_bytes / (1024 * 1024)
                                         total_size += file_size
                                         self.logger.info(f"Media file {actual_path} loaded successfully, size: {file_size:.2f} MB")
                                     else:
@@ -2768,13 +3088,16 @@ class TelegramExporter:
                 mode_description = "incremental mode" if append_mode else "initial mode"
                 self.logger.info(f"Exporting {len(messages_data)} messages in {mode_description}")
                 
-                json_file = json_exporter.export_messages(messages_data, append_mode=append_mode)
-                html_file = html_exporter.export_messages(messages_data, append_mode=append_mode)
-                
                 # Для Markdown файла используем append_mode всегда когда файл существует
                 # Это обеспечивает инкрементальное добавление сообщений
-                md_append_mode = append_mode or (md_file_path.exists() and not (hasattr(channel, '_force_full_reexport') and channel._force_full_reexport))
-                md_file = md_exporter.export_messages(messages_data, append_mode=md_append_mode)
+                md_append_mode = append_mode or (md_file_path.exists() and not channel.force_full_reexport)
+                
+                # Форматы пишутся параллельно в рабочих потоках, не блокируя цикл событий
+                json_file, html_file, md_file = await asyncio.gather(
+                    asyncio.to_thread(json_exporter.export_messages, messages_data, append_mode=append_mode),
+                    asyncio.to_thread(html_exporter.export_messages, messages_data, append_mode=append_mode),
+                    asyncio.to_thread(md_exporter.export_messages, messages_data, append_mode=md_append_mode)
+                )
                 
                 # Проверка создания файлов экспорта
                 export_files_created = []
@@ -2797,9 +3120,9 @@ class TelegramExporter:
                 
                 # Обновление статистики канала - только при инкрементальном экспорте
                 # При полном ре-экспорте total_messages уже установлен правильно выше
-                if not (hasattr(channel, '_force_full_reexport') and channel._force_full_reexport):
+                if not channel.force_full_reexport:
                     channel.total_messages += len(messages_data)
-                channel.last_check = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self._touch_last_check(channel, now)
                 
                 # Обновление общей статистики
                 # Обновление общей статистики
@@ -2827,7 +3150,7 @@ class TelegramExporter:
                 
                 # После-экспортная проверка MD файла и автоматический ре-экспорт
                 # Только если это не рекурсивный вызов (не MD verification)
-                if not getattr(self, '_in_md_verification', False):
+                if not channel.in_md_verification:
                     if md_file and Path(md_file).exists():
                         self.logger.info(f"Проверка MD файла после экспорта для {channel.title}")
                         self.stats.md_verification_status = "Проверка MD файла"
@@ -2843,18 +3166,20 @@ class TelegramExporter:
                         if not md_matches and (discrepancy_type == "missing" or discrepancy_type == "imbalance"):
                             reason = "отсутствует MD файл" if discrepancy_type == "missing" else "дисбаланс сообщений (>2 раза)"
                             self.logger.warning(f"MD файл для {channel.title} требует реэкспорта: {reason}")
-                            self.stats.md_reexport_count += 1
-                            self.stats.md_verification_progress = f"Требуется ре-экспорт: {reason}, попытка #{self.stats.md_reexport_count}"
+                            reexport_attempt = self._md_reexport_attempts.get(channel.title, 0) + 1
+                            self._md_reexport_attempts[channel.title] = reexport_attempt
+                            self.stats.md_reexport_count = reexport_attempt
+                            self.stats.md_verification_progress = f"Требуется ре-экспорт: {reason}, попытка #{reexport_attempt}"
                             
                             # Сохраняем причину для уведомления
                             reexport_reason = reason
                             
                             # Проверяем максимальное количество попыток ре-экспорта
                             max_reexport_attempts = 3
-                            if self.stats.md_reexport_count <= max_reexport_attempts:
+                            if reexport_attempt <= max_reexport_attempts:
                                 try:
                                     # Устанавливаем флаг, чтобы предотвратить отправку уведомлений во время рекурсивного вызова
-                                    self._in_md_verification = True
+                                    channel.in_md_verification = True
                                     
                                     # Принудительно пересчитываем сообщения в канале заново
                                     self.logger.info(f"Повторный подсчет сообщений в {channel.title} для ре-экспорта")
@@ -2873,10 +3198,10 @@ class TelegramExporter:
                                     channel.last_message_id = 0
                                     
                                     # Отмечаем, что это принудительный полный ре-экспорт
-                                    channel._force_full_reexport = True
+                                    channel.force_full_reexport = True
                                     
                                     try:
-                                        await self.export_channel(channel)
+                                        await self.export_channel(channel, now=now)
                                         self.logger.info(f"Успешно выполнен повторный экспорт для {channel.title}")
                                         
                                         # Отправляем уведомление о реэкспорте с причиной
@@ -2888,21 +3213,20 @@ class TelegramExporter:
                                         # Восстанавливаем оригинальное значение
                                         channel.last_message_id = original_last_id
                                         # Убираем флаг принудительного ре-экспорта
-                                        if hasattr(channel, '_force_full_reexport'):
-                                            delattr(channel, '_force_full_reexport')
+                                        channel.force_full_reexport = False
                                         # Сбрасываем флаг MD верификации
-                                        self._in_md_verification = False
+                                        channel.in_md_verification = False
                                 except Exception as e:
                                     self.logger.error(f"Ошибка в процессе повторного экспорта {channel.title}: {e}")
                                     # Сбрасываем флаг MD верификации в случае ошибки
-                                    self._in_md_verification = False
+                                    channel.in_md_verification = False
                             else:
                                 self.logger.error(f"Превышено максимальное количество попыток ре-экспорта для {channel.title}")
                                 # Сбрасываем флаг MD верификации
-                                self._in_md_verification = False
+                                channel.in_md_verification = False
                         else:
                             # MD файл совпадает или обычное несоответствие (дополняем, не перезаписываем)
-                            self._in_md_verification = False
+                            channel.in_md_verification = False
                             
                             # Если есть обычное несоответствие, но не дисбаланс и файл есть, 
                             # то при следующем экспорте новые сообщения будут добавлены
@@ -2910,13 +3234,13 @@ class TelegramExporter:
                                 self.logger.info(f"MD файл для {channel.title} будет дополнен при следующем экспорте новых сообщений")
                     else:
                         # Нет MD файла, сбрасываем флаг
-                        self._in_md_verification = False
+                        channel.in_md_verification = False
                 else:
                     # Мы в рекурсивном вызове, сбрасываем флаг
-                    self._in_md_verification = False
+                    channel.in_md_verification = False
             else:
                 self.logger.info(f"No new messages found in {channel.title}")
-                channel.last_check = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self._touch_last_check(channel, now)
                 
                 # Проверяем, существуют ли файлы экспорта, если нет - создаем пустые
                 export_files_to_check = [
@@ -2925,17 +3249,17 @@ class TelegramExporter:
                     (md_exporter, "Markdown")
                 ]
                 
+                # Все экспортёры пишут в одну папку канала - читаем её содержимое один раз
+                file_base = json_exporter.sanitize_filename(json_exporter.channel_name)
+                try:
+                    with os.scandir(json_exporter.output_dir) as entries:
+                        present_files = {entry.name for entry in entries}
+                except OSError:
+                    present_files = set()
+                
                 missing_files = []
                 for exporter, format_name in export_files_to_check:
-                    expected_file = None
-                    if format_name == "JSON":
-                        expected_file = exporter.output_dir / f"{exporter.sanitize_filename(exporter.channel_name)}.json"
-                    elif format_name == "HTML":
-                        expected_file = exporter.output_dir / f"{exporter.sanitize_filename(exporter.channel_name)}.html"
-                    elif format_name == "Markdown":
-                        expected_file = exporter.output_dir / f"{exporter.sanitize_filename(exporter.channel_name)}.md"
-                    
-                    if expected_file and not expected_file.exists():
+                    if f"{file_base}.{exporter.file_extension}" not in present_files:
                         missing_files.append((exporter, format_name))
                 
                 # Создаем отсутствующие файлы с пустым содержимым
@@ -2944,19 +3268,19 @@ class TelegramExporter:
                     
                     for exporter, format_name in missing_files:
                         try:
-                            # Создаем файл с пустым списком сообщений
-                            empty_file = exporter.export_messages([], append_mode=False)
-                            if empty_file and Path(empty_file).exists():
+                            # Создаем файл без сообщений (существующий файл не перезаписывается)
+                            empty_file = exporter.create_empty_file()
+                            if empty_file:
                                 self.logger.info(f"Created empty {format_name} file: {empty_file}")
                             else:
-                                self.logger.error(f"Failed to create empty {format_name} file")
+                                self.logger.info(f"{format_name} file already exists, skipping")
                         except Exception as e:
                             self.logger.error(f"Error creating empty {format_name} file: {e}")
                 
                 # Если экспорт прошел без сообщений, но в канале есть сообщения - повторная проверка
                 if total_messages_in_channel > 0:
                     self.logger.info(f"Re-checking channel {channel.title} - found {total_messages_in_channel} total messages")
-                    self.stats.current_export_info = f"Повторная проверка: {channel.title} | Всего сообщений: {total_messages_in_channel}"
+                    self._set_export_info(channel, f"Повторная проверка: {channel.title} | Всего сообщений: {total_messages_in_channel}")
                     
                     # Если это первая проверка и сообщений нет, но в канале они есть - принудительно экспортируем все
                     if channel.last_message_id == 0 and total_messages_in_channel > 0:
@@ -2964,23 +3288,23 @@ class TelegramExporter:
                         # Можно добавить дополнительную диагностику здесь
             
             # Сбрасываем счетчик FloodWait попыток после успешного завершения
-            self._floodwait_retry_count = 0
+            self._floodwait_retries.pop(channel.title, None)
             
             # Обновляем статистику обнаруженных/экспортированных сообщений
-            self._update_discovered_exported_stats()
+            await asyncio.to_thread(self._update_discovered_exported_stats)
             
-            # Очищаем статус проверки MD файлов после успешного экспорта
-            if md_file_missing or self.stats.md_verification_status:
+            # Сбрасываем счетчик повторных экспортов канала после успешного завершения
+            self._md_reexport_attempts.pop(channel.title, None)
+            # Очищаем статус проверки MD файлов, если он относится к этому каналу
+            if self.stats.md_verification_channel == channel.title:
                 self.stats.md_verification_status = None
                 self.stats.md_verification_channel = None
                 self.stats.md_verification_progress = None
-                # Сбрасываем счетчик повторных экспортов после успешного завершения
                 self.stats.md_reexport_count = 0
                 self.logger.info(f"Экспорт для {channel.title} успешно завершен, MD проверка очищена")
             
             # Убираем флаг принудительного ре-экспорта
-            if hasattr(channel, '_force_full_reexport'):
-                delattr(channel, '_force_full_reexport')
+            channel.force_full_reexport = False
             
             # Сохранение обновленной информации о каналах (включая last_message_id и total_messages)
             self.save_channels()
@@ -2993,9 +3317,11 @@ class TelegramExporter:
             notification = self._create_notification(channel, 0, False, str(e))
             await self.send_notification(notification)
         finally:
-            # Очищаем информацию о текущем экспорте
-            self.stats.current_export_info = None
-            self.stats.total_messages_in_channel = 0
+            # Очищаем информацию об экспорте этого канала (экспорт других каналов продолжается)
+            self._clear_export_info(channel)
+            if not self._export_infos:
+                self.stats.total_messages_in_channel = 0
+            self._mark_ui_dirty()
     
     def reset_channel_export_state(self, channel_title: str) -> bool:
         """Сброс состояния экспорта канала для принудительного переэкспорта всех сообщений"""
@@ -3005,8 +3331,10 @@ class TelegramExporter:
                 channel.last_message_id = 0
                 channel.total_messages = 0
                 channel.last_check = None
+                channel.last_check_dt = None
+                self._last_check_version += 1
                 # Отмечаем, что при следующем экспорте нужно полностью переэкспортировать
-                channel._force_full_reexport = True
+                channel.force_full_reexport = True
                 self.logger.info(f"Reset export state for channel {channel_title}: last_message_id {old_id} -> 0")
                 self.save_channels()
                 return True
@@ -3026,14 +3354,8 @@ class TelegramExporter:
             self.logger.info(f"Проверка целостности экспорта для канала: {channel.title}")
             
             # Получаем путь к директории канала
-            try:
-                storage_cfg = self.config_manager.config.storage
-                base_dir = getattr(storage_cfg, 'export_base_dir', 'exports') or 'exports'
-            except Exception:
-                base_dir = 'exports'
-            
-            base_path = Path(base_dir)
-            sanitized_title = self._sanitize_channel_filename(channel.title)
+            base_path = self._base_path
+            sanitized_title = self._get_sanitized_title(channel)
             channel_dir = base_path / sanitized_title
             
             # Проверяем существование JSON файла экспорта
@@ -3044,18 +3366,26 @@ class TelegramExporter:
             
             # Читаем существующий экспорт
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    export_data = json.load(f)
+                with open(json_file, 'rb') as f:
+                    export_data = load_json_bytes(f.read())
                 
                 if not isinstance(export_data, list):
                     self.logger.warning(f"Неверный формат JSON файла для {channel.title}")
                     return False
                 
-                # Извлекаем ID сообщений из экспорта
+                # Извлекаем ID сообщений из экспорта, попутно находя минимальный и максимальный ID
                 exported_ids = set()
+                min_exported_id = max_exported_id = 0
                 for msg in export_data:
                     if isinstance(msg, dict) and 'id' in msg:
-                        exported_ids.add(msg['id'])
+                        msg_id = msg['id']
+                        if not exported_ids:
+                            min_exported_id = max_exported_id = msg_id
+                        elif msg_id < min_exported_id:
+                            min_exported_id = msg_id
+                        elif msg_id > max_exported_id:
+                            max_exported_id = msg_id
+                        exported_ids.add(msg_id)
                 
                 self.logger.info(f"Найдено {len(exported_ids)} сообщений в существующем экспорте")
                 
@@ -3086,7 +3416,6 @@ class TelegramExporter:
                 missing_ids = []
                 
                 # 1. Новые сообщения после последнего экспортированного
-                max_exported_id = max(exported_ids) if exported_ids else 0
                 if last_id > max_exported_id:
                     # Получаем новые сообщения
                     async for message in self.client.iter_messages(entity, min_id=max_exported_id, limit=None):
@@ -3096,16 +3425,12 @@ class TelegramExporter:
                 # 2. Пропуски в середине диапазона
                 # Проверяем наличие значительных пропусков (более 10 подряд отсутствующих ID)
                 if exported_ids:
-                    min_exported_id = min(exported_ids)
-                    
-                    # Создаем список всех ID в диапазоне от min до max экспортированных
-                    expected_range = set(range(min_exported_id, max_exported_id + 1))
-                    gaps_in_range = expected_range - exported_ids
+                    # Отсутствующие ID в диапазоне от min до max экспортированных (за один проход, уже по порядку)
+                    sorted_gaps = [msg_id for msg_id in range(min_exported_id, max_exported_id + 1) if msg_id not in exported_ids]
                     
                     # Фильтруем значительные пропуски (где отсутствует более 5 сообщений подряд)
                     significant_gaps = []
-                    if gaps_in_range:
-                        sorted_gaps = sorted(gaps_in_range)
+                    if sorted_gaps:
                         current_gap = [sorted_gaps[0]]
                         
                         for i in range(1, len(sorted_gaps)):
@@ -3206,8 +3531,8 @@ class TelegramExporter:
                         unique_messages.append(msg)
                 
                 # Сохраняем обновленный экспорт
-                with open(json_file, 'w', encoding='utf-8') as f:
-                    json.dump(unique_messages, f, ensure_ascii=False, indent=2)
+                with open(json_file, 'wb') as f:
+                    f.write(dump_json_bytes(unique_messages))
                 
                 self.logger.info(f"Целостность экспорта восстановлена для {channel.title}: добавлено {len(missing_messages)} сообщений")
                 
@@ -3234,8 +3559,11 @@ class TelegramExporter:
                     html_exporter = HTMLExporter(channel.title, channel_dir)
                     md_exporter = MarkdownExporter(channel.title, channel_dir)
                     
-                    html_exporter.export_messages(updated_messages, append_mode=False)  # Перезаписываем полностью
-                    md_exporter.export_messages(updated_messages, append_mode=False)  # Перезаписываем полностью
+                    # Перезаписываем полностью, оба файла параллельно в рабочих потоках
+                    await asyncio.gather(
+                        asyncio.to_thread(html_exporter.export_messages, updated_messages, append_mode=False),
+                        asyncio.to_thread(md_exporter.export_messages, updated_messages, append_mode=False)
+                    )
                     
                     self.logger.info(f"Обновлены HTML и Markdown файлы для {channel.title}")
                     
@@ -3258,48 +3586,24 @@ class TelegramExporter:
     
     def _create_notification(self, channel: ChannelInfo, messages_count: int, success: bool, error: str = None) -> str:
         """Создание текста уведомления о новых сообщениях"""
+        # Уведомления отправляются с parse_mode=HTML, поэтому экранируем подставляемые значения
+        fields = {'title': html.escape(channel.title), 'count': messages_count, 'ts': self._now_str()}
         if success and messages_count > 0:
-            return f"""
-📢 <b>Новые сообщения в канале</b>
-
-🔗 <b>Канал:</b> {channel.title}
-📊 <b>Новых сообщений:</b> {messages_count}
-📅 <b>Время:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-✅ <b>Статус:</b> Успешно экспортировано
-
-📁 Файлы сохранены в папку: {channel.title}
-            """.strip()
+            return _NOTIFY_NEW_MESSAGES_TPL.format_map(fields)
         elif success and messages_count == 0:
-            return f"""
-📢 <b>Проверка канала завершена</b>
-
-🔗 <b>Канал:</b> {channel.title}
-📊 <b>Новых сообщений:</b> не найдено
-📅 <b>Время:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-✅ <b>Статус:</b> Проверка выполнена
-            """.strip()
+            return _NOTIFY_NO_MESSAGES_TPL.format_map(fields)
         else:
-            return f"""
-📢 <b>Ошибка экспорта канала</b>
-
-🔗 <b>Канал:</b> {channel.title}
-📅 <b>Время:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-❌ <b>Статус:</b> Ошибка
-🔍 <b>Причина:</b> {error or 'Неизвестная ошибка'}
-            """.strip()
+            if error:
+                fields['error'] = html.escape(error)
+            return _NOTIFY_ERROR_TPL.format_map(ChainMap(fields, _NOTIFY_DEFAULTS))
     
     def _create_reexport_notification(self, channel: ChannelInfo, reason: str) -> str:
         """Создание текста уведомления о реэкспорте"""
-        return f"""
-🔄 <b>Выполнен реэкспорт канала</b>
-
-🔗 <b>Канал:</b> {channel.title}
-❓ <b>Причина:</b> {reason}
-📅 <b>Время:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-✅ <b>Статус:</b> Реэкспорт завершен
-
-📁 Файлы сохранены в папку: {channel.title}
-        """.strip()
+        return _NOTIFY_REEXPORT_TPL.format_map({
+            'title': html.escape(channel.title),
+            'reason': html.escape(reason),
+            'ts': self._now_str(),
+        })
     
     async def main_loop(self):
         """Упрощенный основной цикл программы без управления клавишами"""
@@ -3307,16 +3611,9 @@ class TelegramExporter:
             # Проверяем, нужен ли начальный экспорт
             if self.channels:
                 need_initial_export = False
+                now = datetime.now()
                 for channel in self.channels:
-                    if not channel.last_check:
-                        need_initial_export = True
-                        break
-                    try:
-                        last_check = datetime.strptime(channel.last_check, "%Y-%m-%d %H:%M:%S")
-                        if (datetime.now() - last_check).days >= 1:
-                            need_initial_export = True
-                            break
-                    except:
+                    if channel.last_check_dt is None or (now - channel.last_check_dt).days >= 1:
                         need_initial_export = True
                         break
                 
@@ -3325,17 +3622,47 @@ class TelegramExporter:
                     asyncio.create_task(self.export_all_channels())
                 
                 # Проверяем наличие MD файлов для всех каналов
-                self._check_missing_md_files()
+                await self._check_missing_md_files()
             
-            with Live(self.create_status_display(), refresh_per_second=2) as live:
-                # Запуск планировщика в фоне
-                scheduler_task = asyncio.create_task(self.run_scheduler())
+            with Live(self.create_status_display(), auto_refresh=False) as live:
+                self.setup_scheduler()
+                
+                # Единый цикл вместо отдельных циклов опроса для интерфейса и планировщика.
+                # Периодические действия хранятся в куче (срок, порядковый номер, действие);
+                # действие возвращает паузу до своего следующего запуска.
+                order = itertools.count()
+                timers = [(time.monotonic(), next(order), self.run_scheduled_jobs)]
+                next_redraw = 0.0
+                last_redraw = 0.0
                 
-                # Основной цикл
                 while self.running:
-                    # Обновляем интерфейс
-                    live.update(self.create_status_display())
-                    await asyncio.sleep(0.5)
+                    tick = time.monotonic()
+                    
+                    # Перерисовываем интерфейс при изменении состояния (не чаще раза
+                    # в UI_MIN_REDRAW_INTERVAL - частые изменения объединяются в одну перерисовку),
+                    # а в простое - раз в UI_IDLE_REFRESH_INTERVAL (для часов и анимации)
+                    if tick >= next_redraw or (self._ui_dirty.is_set() and tick >= last_redraw + self.UI_MIN_REDRAW_INTERVAL):
+                        self._ui_dirty.clear()
+                        live.update(self.create_status_display(), refresh=True)
+                        last_redraw = tick
+                        next_redraw = tick + self.UI_IDLE_REFRESH_INTERVAL
+                    
+                    while timers and timers[0][0] <= tick:
+                        _, _, action = heapq.heappop(timers)
+                        delay = action()
+                        heapq.heappush(timers, (tick + delay, next(order), action))
+                    
+                    # Спим до ближайшего срока; изменение состояния будит цикл раньше
+                    deadline = min(next_redraw, timers[0][0]) if timers else next_redraw
+                    if self._ui_dirty.is_set():
+                        # Изменения уже есть - ждём окончания минимального интервала перерисовки
+                        deadline = min(deadline, last_redraw + self.UI_MIN_REDRAW_INTERVAL)
+                        await asyncio.sleep(max(deadline - time.monotonic(), 0.0))
+                    else:
+                        try:
+                            await asyncio.wait_for(self._ui_dirty.wait(), timeout=max(deadline - time.monotonic(), 0.0))
+                        except asyncio.TimeoutError:
+                            pass
                     
         except KeyboardInterrupt:
             self.console.print("\n[yellow]Получен сигнал завершения (Ctrl+C)...[/yellow]")
@@ -3345,41 +3672,60 @@ class TelegramExporter:
             if self.client:
                 await self.client.disconnect()
     
-    def _check_missing_md_files(self):
+    @staticmethod
+    def _list_channel_dirs(base_path: Path) -> Optional[set]:
+        """Нормализованные имена подкаталогов базового каталога экспорта (один проход os.scandir)
+        
+        Имена приводятся через _channel_dir_key, так как Windows отбрасывает завершающие
+        точки и пробелы и не различает регистр, а macOS хранит имена в NFD.
+        
+        Returns:
+            Optional[set]: Множество имён или None, если каталог не удалось прочитать
+        """
+        try:
+            with os.scandir(base_path) as it:
+                return {_channel_dir_key(entry.name) for entry in it if entry.is_dir()}
+        except FileNotFoundError:
+            return set()
+        except OSError:
+            return None
+    
+    async def _check_missing_md_files(self):
         """Проверяет наличие MD файлов и запускает экспорт при их отсутствии"""
         try:
             # Получаем базовый каталог экспорта
-            try:
-                storage_cfg = self.config_manager.config.storage  # type: ignore[attr-defined]
-                base_dir = getattr(storage_cfg, 'export_base_dir', 'exports') or 'exports'
-            except Exception:
-                base_dir = 'exports'
-            
-            base_path = Path(base_dir)
+            base_path = self._base_path
             channels_needing_export = []
             
-            for channel in self.channels:
-                sanitized_title = self._sanitize_channel_filename(channel.title)
-                channel_dir = base_path / sanitized_title
-                md_file = channel_dir / f"{sanitized_title}.md"
-                
-                if not md_file.exists():
+            # Одним чтением базового каталога узнаём, какие папки каналов вообще существуют:
+            # для каналов без папки MD файла заведомо нет и stat() не нужен
+            existing_dirs = await asyncio.to_thread(self._list_channel_dirs, base_path)
+            md_exists = [False] * len(self.channels)
+            to_check = [
+                i for i, channel in enumerate(self.channels)
+                if existing_dirs is None or _channel_dir_key(self._get_sanitized_title(channel)) in existing_dirs
+            ]
+            
+            # Оставшиеся MD файлы проверяем одновременно в пуле потоков,
+            # чтобы не выполнять stat() для каждого канала последовательно
+            checked = await asyncio.gather(*(
+                asyncio.to_thread(self._get_channel_md_path(self.channels[i], base_path).exists)
+                for i in to_check
+            ))
+            for i, exists in zip(to_check, checked):
+                md_exists[i] = exists
+            
+            for channel, exists in zip(self.channels, md_exists):
+                if not exists:
                     self.logger.info(f"MD файл отсутствует для канала: {channel.title}")
                     channels_needing_export.append(channel)
             
             if channels_needing_export:
                 self.logger.info(f"Найдено {len(channels_needing_export)} каналов без MD файлов, запуск экспорта")
                 
-                # Запускаем экспорт для каналов без MD файлов синхронно
-                # Чтобы обеспечить обработку всех каналов
-                try:
-                    loop = asyncio.get_running_loop()
-                    # Запускаем в фоновом режиме, но логируем начало
-                    task = loop.create_task(self._export_missing_md_channels(channels_needing_export))
-                    self.logger.info("Задача экспорта каналов без MD файлов запущена")
-                except RuntimeError:
-                    # Если нет текущего event loop, создаем новый
-                    self.logger.warning("Нет активного event loop, экспорт MD файлов будет отложен")
+                # Запускаем экспорт в фоновом режиме, но логируем начало
+                asyncio.create_task(self._export_missing_md_channels(channels_needing_export))
+                self.logger.info("Задача экспорта каналов без MD файлов запущена")
                 
         except Exception as e:
             self.logger.error(f"Ошибка проверки MD файлов: {e}")
@@ -3389,23 +3735,28 @@ class TelegramExporter:
         try:
             self.logger.info(f"Начало экспорта {len(channels)} каналов без MD файлов")
             
-            # Устанавливаем флаг, чтобы предотвратить отправку уведомлений во время этого процесса
-            original_in_md_verification = getattr(self, '_in_md_verification', False)
-            self._in_md_verification = True
+            # Каналы экспортируются параллельно, но не более нескольких одновременно,
+            # чтобы не спровоцировать FloodWait со стороны Telegram
+            semaphore = asyncio.Semaphore(self.MISSING_MD_EXPORT_CONCURRENCY)
             
-            try:
-                for i, channel in enumerate(channels):
+            async def export_one(i: int, channel: ChannelInfo):
+                async with semaphore:
+                    # Канал уже экспортируется основной задачей - она и создаст MD файл
+                    if not self._claim_channel_export(channel):
+                        return
                     self.logger.info(f"Запуск экспорта для канала без MD файла: {channel.title} ({i+1}/{len(channels)})")
                     
                     # Обновляем информацию о текущем экспорте для авто-прокрутки
-                    self.stats.current_export_info = f"Полный ре-экспорт {i+1}/{len(channels)}: {channel.title}"
+                    self._set_export_info(channel, f"Полный ре-экспорт {i+1}/{len(channels)}: {channel.title}")
+                    self._mark_ui_dirty()
                     
                     # Сбрасываем last_message_id чтобы загрузить все сообщения
                     original_last_id = channel.last_message_id
                     channel.last_message_id = 0
                     
-                    # Отмечаем, что это принудительный полный ре-экспорт
-                    channel._force_full_reexport = True
+                    # Отмечаем, что это принудительный полный ре-экспорт в рамках проверки MD
+                    channel.force_full_reexport = True
+                    channel.in_md_verification = True
                     
                     try:
                         await self.export_channel(channel)
@@ -3419,51 +3770,62 @@ class TelegramExporter:
                         # Восстанавливаем оригинальное значение при ошибке
                         channel.last_message_id = original_last_id
                     finally:
-                        # Убираем флаг принудительного ре-экспорта
-                        if hasattr(channel, '_force_full_reexport'):
-                            delattr(channel, '_force_full_reexport')
-                        # Очищаем информацию о текущем экспорте между каналами
-                        self.stats.current_export_info = None
-                        # Небольшая пауза для обновления UI
-                        await asyncio.sleep(0.5)
-                
-                self.logger.info(f"Завершен экспорт {len(channels)} каналов без MD файлов")
-                # Обновляем статистику обнаруженных/экспортированных сообщений
-                self._update_discovered_exported_stats()
-                # Окончательно очищаем информацию о экспорте
-                self.stats.current_export_info = None
-            finally:
-                # Восстанавливаем оригинальное значение флага
-                self._in_md_verification = original_in_md_verification
+                        # Убираем флаги принудительного ре-экспорта
+                        channel.force_full_reexport = False
+                        channel.in_md_verification = False
+                        self._release_channel_export(channel)
+                        self._clear_export_info(channel)
+                        self._mark_ui_dirty()
+            
+            await asyncio.gather(*(export_one(i, channel) for i, channel in enumerate(channels)))
+            
+            self.logger.info(f"Завершен экспорт {len(channels)} каналов без MD файлов")
+            # Обновляем статистику обнаруженных/экспортированных сообщений
+            await asyncio.to_thread(self._update_discovered_exported_stats)
         except Exception as e:
             self.logger.error(f"Ошибка экспорта каналов без MD файлов: {e}")
         finally:
-            # Гарантируем очистку состояния
-            self.stats.current_export_info = None
+            # Каждая задача убирает только свою строку прогресса; прогресс
+            # параллельного основного экспорта остаётся в статусе
+            self._refresh_export_info()
     
     async def export_all_channels(self):
         """Экспорт всех каналов"""
         self.logger.info("Starting scheduled export of all channels")
         
-        for i, channel in enumerate(self.channels):
-            try:
-                # Обновляем информацию о текущем экспорте для авто-прокрутки
-                self.stats.current_export_info = f"Экспорт {i+1}/{len(self.channels)}: {channel.title}"
-                await self.export_channel(channel)
-            except Exception as e:
-                self.logger.error(f"Export error for channel {channel.title}: {e}")
-                self.stats.export_errors += 1
-            finally:
-                # Очищаем информацию о текущем экспорте между каналами
-                self.stats.current_export_info = None
-                # Небольшая пауза для обновления UI
-                await asyncio.sleep(0.5)
+        # Одно время проверки на весь проход вместо datetime.now() для каждого канала
+        now = datetime.now()
         
-        self.stats.last_export_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Каналы экспортируются параллельно, чтобы ожидание ответов Telegram перекрывалось,
+        # но не более EXPORT_CONCURRENCY одновременно, чтобы не спровоцировать FloodWait
+        semaphore = asyncio.Semaphore(self.EXPORT_CONCURRENCY)
+        
+        async def export_one(i: int, channel: ChannelInfo):
+            async with semaphore:
+                if not self._claim_channel_export(channel):
+                    return
+                try:
+                    # Обновляем информацию о текущем экспорте для авто-прокрутки
+                    self._set_export_info(channel, f"Экспорт {i+1}/{len(self.channels)}: {channel.title}")
+                    self._mark_ui_dirty()
+                    await self.export_channel(channel, now=now)
+                except Exception as e:
+                    self.logger.error(f"Export error for channel {channel.title}: {e}")
+                    self.stats.export_errors += 1
+                finally:
+                    self._release_channel_export(channel)
+                    # Очищаем информацию об экспорте только этого канала
+                    self._clear_export_info(channel)
+                    self._mark_ui_dirty()
+        
+        await asyncio.gather(*(export_one(i, channel) for i, channel in enumerate(self.channels)))
+        
+        self.stats.last_export_time = self._now_str()
         # Обновляем статистику обнаруженных/экспортированных сообщений
-        self._update_discovered_exported_stats()
-        # Окончательно очищаем информацию о экспорте
-        self.stats.current_export_info = None
+        await asyncio.to_thread(self._update_discovered_exported_stats)
+        # Прогресс других задач экспорта (если они ещё идут) остаётся в статусе
+        self._refresh_export_info()
+        self._mark_ui_dirty()
 
     async def run(self):
         """Главный метод запуска программы"""
@@ -3478,9 +3840,10 @@ class TelegramExporter:
             return
         
         # Возможность изменения конфигурации
-        if Confirm.ask("Изменить настройки конфигурации?", default=False):
+        if await self._ask(Confirm, "Изменить настройки конфигурации?", default=False):
             if not self.config_manager.interactive_setup():
                 return
+        self._refresh_paths()
         
         # Предложить импорт/экспорт списка каналов в произвольный JSON
         try:
@@ -3493,27 +3856,27 @@ class TelegramExporter:
                 "- [i]skip[/i] — пропустить",
                 title="Импорт/Экспорт каналов", box=box.ROUNDED
             ))
-            io_action = Prompt.ask("Действие", choices=["import", "export", "reset", "skip"], default="skip")
+            io_action = await self._ask(Prompt, "Действие", choices=["import", "export", "reset", "skip"], default="skip")
             if io_action == "import":
                 # Перед импортом попробуем подтянуть актуальный файл с WebDAV
                 if self._webdav_enabled():
                     await self._webdav_download_and_notify()
-                path_str = Prompt.ask("Путь к JSON-файлу для импорта", default="channels.json")
+                path_str = await self._ask(Prompt, "Путь к JSON-файлу для импорта", default="channels.json")
                 file_path = Path(path_str)
-                if not file_path.exists():
+                if not await asyncio.to_thread(file_path.exists):
                     self.console.print(f"[red]Файл {file_path} не найден[/red]")
                 else:
-                    if self.load_channels_from_file(file_path):
+                    if await asyncio.to_thread(self.load_channels_from_file, file_path):
                         self.console.print(f"[green]✓ Импортировано каналов: {len(self.channels)}[/green]")
             elif io_action == "export":
                 # Если каналов пока нет — дадим возможность выбрать, чтобы было что сохранять
-                if not self.channels and Confirm.ask("Список каналов пуст. Выбрать каналы перед экспортом?", default=True):
+                if not self.channels and await self._ask(Confirm, "Список каналов пуст. Выбрать каналы перед экспортом?", default=True):
                     # Инициализация клиента перед выбором
                     if not await self.initialize_client():
                         return
                     await self.select_channels()
-                path_str = Prompt.ask("Путь для сохранения JSON", default="channels.json")
-                self.save_channels_to_file(Path(path_str))
+                path_str = await self._ask(Prompt, "Путь для сохранения JSON", default="channels.json")
+                await asyncio.to_thread(self.save_channels_to_file, Path(path_str))
                 # После сохранения — выгрузка на WebDAV, если включен и совпадает основной путь
                 if self._webdav_enabled():
                     await self._webdav_upload_and_notify()
@@ -3525,7 +3888,7 @@ class TelegramExporter:
                     for i, title in enumerate(problematic_channels, 1):
                         self.console.print(f"  {i}. {title}")
                     
-                    if Confirm.ask("Сбросить состояние экспорта для этих каналов?", default=False):
+                    if await self._ask(Confirm, "Сбросить состояние экспорта для этих каналов?", default=False):
                         for title in problematic_channels:
                             if self.reset_channel_export_state(title):
                                 self.console.print(f"[green]✓ Сброшено состояние для канала: {title}[/green]")
@@ -3541,8 +3904,9 @@ class TelegramExporter:
         
         # Загрузка или выбор каналов
         if not self.channels:
-            if self.channels_file.exists() and Confirm.ask("Использовать сохраненный список каналов?"):
-                self.load_channels()
+            channels_file_exists = await asyncio.to_thread(self.channels_file.exists)
+            if channels_file_exists and await self._ask(Confirm, "Использовать сохраненный список каналов?"):
+                await asyncio.to_thread(self.load_channels)
             else:
                 await self.select_channels()
         
@@ -3554,7 +3918,7 @@ class TelegramExporter:
         self.stats.total_channels = len(self.channels)
         
         # Обновляем статистику обнаруженных и экспортированных сообщений
-        self._update_discovered_exported_stats()
+        await asyncio.to_thread(self._update_discovered_exported_stats)
         
         # Проверка целостности экспорта при запуске
         self.console.print("[yellow]Проверка целостности экспортов...[/yellow]")
@@ -3577,7 +3941,7 @@ class TelegramExporter:
         self.save_channels()
         
         # Обновляем статистику обнаруженных/экспортированных сообщений
-        self._update_discovered_exported_stats()
+        await asyncio.to_thread(self._update_discovered_exported_stats)
         
         if integrity_fixed > 0:
             self.console.print(f"[green]✓ Целостность восстановлена для {integrity_fixed} каналов[/green]")
@@ -3604,5 +3968,18 @@ async def main():
     await exporter.run()
 
 
+def _run_event_loop(coro):
+    """Запуск корутины на uvloop, если он установлен (Linux/macOS), иначе на стандартном цикле"""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    _run_event_loop(main())